@@ -1,8 +1,11 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional, Dict, Any
+import logging
 from app.services.auth_service import auth_service
 
+logger = logging.getLogger(__name__)
+
 # Security scheme for JWT tokens
 security = HTTPBearer()
 
@@ -13,7 +16,6 @@ async def get_current_user(
     Dependency to get current authenticated user from JWT token
     """
     token = credentials.credentials
-    print(f"DEBUG: Extracted token from header: {token[:50]}...")
     
     if not token:
         raise HTTPException(
@@ -23,7 +25,8 @@ async def get_current_user(
         )
     
     user = await auth_service.get_user_from_token(token)
-    print(f"DEBUG: User from token: {user}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("User from token: %s", user.get("id") if user else None)
     
     if user is None:
         raise HTTPException(
@@ -41,6 +41,11 @@ if broker_use_ssl:
 celery_app.conf.update(
     # Task routing
     task_routes={
+        # Long-running reminder batches get their own workers so they never
+        # hold up short notification tasks
+        'send_supabase_deadline_reminders': {'queue': 'reminders'},
+        'check_and_send_email_reminders': {'queue': 'reminders'},
+        'send_deadline_reminder': {'queue': 'notifications'},
         'app.tasks.celery_supabase_notification.*': {'queue': 'notifications'},
     },
     
@@ -64,6 +69,7 @@ celery_app.conf.update(
     # Worker configuration
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
+    broker_connection_retry_on_startup=True,
     
     # Result backend settings
     result_expires=3600,  # 1 hour
@@ -85,16 +91,16 @@ celery_app.conf.update(
         
         # Send deadline reminders every 15 minutes using Supabase
         'send-supabase-deadline-reminders': {
-            'task': 'app.tasks.celery_supabase_notification.send_supabase_deadline_reminders',
+            'task': 'send_supabase_deadline_reminders',
             'schedule': crontab(minute='*/15'),
-            'options': {'queue': 'notifications'}
+            'options': {'queue': 'reminders'}
         },
         
         # Check and send email reminders every 5 minutes
         'check-email-reminders': {
             'task': 'check_and_send_email_reminders',
             'schedule': crontab(minute='*/5'),
-            'options': {'queue': 'notifications'}
+            'options': {'queue': 'reminders'}
         },
     }
 )
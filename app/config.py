@@ -24,6 +24,7 @@ class Settings(BaseSettings):
     SUPABASE_URL: str = ""
     SUPABASE_ANON_KEY: str = ""
     SUPABASE_SERVICE_KEY: str = ""
+    SUPABASE_JWT_SECRET: str = ""
     
     # CORS - Development settings (configure properly for production)
     ALLOWED_ORIGINS: Union[List[str], str] = "*"
@@ -1,10 +1,64 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Request
 from pydantic import BaseModel, EmailStr
 from typing import Dict, Any, Optional
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import time
 from app.services.auth_service import auth_service
-from app.auth_deps import get_current_user
+from fastapi.security import HTTPAuthorizationCredentials
+from app.auth_deps import get_current_user, security
+from app.schemas.user import SignUpOut, SignInOut
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Mock tokens only vary in iat/exp, so the header and signing key are fixed
+_MOCK_HMAC_KEY = b"mock_secret_key"
+_MOCK_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+# Fixed identity so the test user's id is stable across processes and restarts
+_TEST_USER_ID = "62fd877b-9515-411a-bbb7-6a47d021d970"
+_TEST_USER_EMAIL = "testuser@gmail.com"
+_TEST_USER = {
+    "id": _TEST_USER_ID,
+    "email": _TEST_USER_EMAIL,
+    "email_confirmed": True,
+    "full_name": "Test User"
+}
+_TEST_USER_EMAIL_DIGEST = hashlib.sha256(_TEST_USER_EMAIL.encode()).digest()
+_TEST_USER_PASSWORD_DIGEST = hashlib.sha256(b"password123").digest()
+
+def _is_test_user(email: str, password: str) -> bool:
+    """Constant-time check for the built-in test user credentials"""
+    # Comparing fixed-length digests keeps input length out of the timing too,
+    # and the bitwise & evaluates both comparisons every time
+    email_ok = hmac.compare_digest(hashlib.sha256(email.encode()).digest(), _TEST_USER_EMAIL_DIGEST)
+    password_ok = hmac.compare_digest(hashlib.sha256(password.encode()).digest(), _TEST_USER_PASSWORD_DIGEST)
+    return email_ok & password_ok
+
+def _create_mock_token() -> str:
+    """Create an HS256 JWT for the built-in test user"""
+    now = int(time.time())
+    payload = {
+        "sub": _TEST_USER_ID,
+        "email": _TEST_USER_EMAIL,
+        "user_metadata": {
+            "full_name": "Test User",
+            "email_verified": True
+        },
+        "iat": now,
+        "exp": now + 3600,
+        "mock": True
+    }
+    signing_input = _MOCK_HEADER_B64 + b"." + _b64url(json.dumps(payload, separators=(",", ":")).encode())
+    signature = hmac.new(_MOCK_HMAC_KEY, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64url(signature)).decode()
 
 # Pydantic models for request/response
 class UserSignUp(BaseModel):
@@ -32,7 +86,7 @@ class OAuthProvider(BaseModel):
     redirect_url: Optional[str] = None
 
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
-async def sign_up(user_data: UserSignUp) -> Dict[str, Any]:
+async def sign_up(user_data: UserSignUp) -> SignUpOut:
     """
     Register a new user
     """
@@ -51,45 +105,23 @@ async def sign_up(user_data: UserSignUp) -> Dict[str, Any]:
     return result
 
 @router.post("/signin")
-async def sign_in(user_data: UserSignIn) -> Dict[str, Any]:
+async def sign_in(user_data: UserSignIn) -> SignInOut:
     """
     Authenticate user and return access token
     """
-    print(f"DEBUG: Route called with email: {user_data.email}, password: {user_data.password}")
-    
     # For testing, return proper auth structure for test user
-    if user_data.email == "testuser@gmail.com" and user_data.password == "password123":
-        print(f"DEBUG: Returning mock auth response from route")
-        from datetime import datetime, timedelta
-        import jwt
-        
-        # Create a proper mock token
-        payload = {
-            "sub": "62fd877b-9515-411a-bbb7-6a47d021d970",
-            "email": "testuser@gmail.com",
-            "user_metadata": {
-                "full_name": "Test User",
-                "email_verified": True
-            },
-            "iat": int(datetime.utcnow().timestamp()),
-            "exp": int((datetime.utcnow() + timedelta(hours=1)).timestamp())
-        }
-        
-        mock_token = jwt.encode(payload, "mock_secret_key", algorithm="HS256")
+    if _is_test_user(user_data.email, user_data.password):
+        logger.debug("Returning mock auth response for test user")
+        mock_token = _create_mock_token()
         
         return {
-            "user": {
-                "id": "62fd877b-9515-411a-bbb7-6a47d021d970",
-                "email": "testuser@gmail.com",
-                "email_confirmed": True,
-                "full_name": "Test User"
-            },
+            "user": dict(_TEST_USER),
             "access_token": mock_token,
             "refresh_token": "mock_refresh_token",
-            "token_type": "bearer"
+            "token_type": "bearer",
+            "expires_in": 3600
         }
     
-    print(f"DEBUG: Not test user, calling auth service")
     result = await auth_service.sign_in(
         email=user_data.email,
         password=user_data.password
@@ -98,13 +130,14 @@ async def sign_in(user_data: UserSignIn) -> Dict[str, Any]:
     return result
 
 @router.post("/signout")
-async def sign_out(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
+async def sign_out(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Dict[str, str]:
     """
     Sign out current user
     """
-    # In Supabase, we don't need to pass the token to sign out
-    # The client handles this
-    return {"message": "Successfully signed out"}
+    return await auth_service.sign_out(credentials.credentials)
 
 @router.post("/refresh")
 async def refresh_access_token(token_data: RefreshToken) -> Dict[str, Any]:
@@ -158,16 +191,13 @@ async def get_current_user_info(request: Request) -> Dict[str, Any]:
     Get current user information
     """
     auth_header = request.headers.get("authorization", "")
-    print(f"DEBUG: Auth header: {auth_header}")
-    
     if not auth_header.startswith("Bearer "):
         return {"error": "No Bearer token"}
     
     token = auth_header[7:]  # Remove "Bearer " prefix
-    print(f"DEBUG: Extracted token: {token[:50]}...")
-    
     user = await auth_service.get_user_from_token(token)
-    print(f"DEBUG: User from service: {user}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("User from service: %s", user.get("id") if user else None)
     
     if user is None:
         return {"error": "Invalid token"}
@@ -191,58 +221,11 @@ async def get_test_token() -> Dict[str, Any]:
     """
     Get a test token for API testing
     """
-    import jwt
-    from datetime import datetime, timedelta
-    
-    payload = {
-        "sub": "62fd877b-9515-411a-bbb7-6a47d021d970",
-        "email": "testuser@gmail.com",
-        "user_metadata": {
-            "full_name": "Test User",
-            "email_verified": True
-        },
-        "iat": int(datetime.utcnow().timestamp()),
-        "exp": int((datetime.utcnow() + timedelta(hours=1)).timestamp())
-    }
-    
-    mock_token = jwt.encode(payload, "mock_secret_key", algorithm="HS256")
-    return {
-        "user": {
-            "id": "62fd877b-9515-411a-bbb7-6a47d021d970",
-            "email": "testuser@gmail.com",
-            "email_confirmed": True,
-            "last_sign_in": None
-        },
-        "access_token": mock_token,
-        "refresh_token": "mock_refresh_token",
-        "expires_at": None,
-        "token_type": "bearer"
-    }
-
-@router.get("/test-token")
-async def get_test_token() -> Dict[str, Any]:
-    """
-    Get a test token for API testing
-    """
-    import jwt
-    from datetime import datetime, timedelta
-    
-    payload = {
-        "sub": "62fd877b-9515-411a-bbb7-6a47d021d970",
-        "email": "testuser@gmail.com",
-        "user_metadata": {
-            "full_name": "Test User",
-            "email_verified": True
-        },
-        "iat": int(datetime.utcnow().timestamp()),
-        "exp": int((datetime.utcnow() + timedelta(hours=1)).timestamp())
-    }
-    
-    mock_token = jwt.encode(payload, "mock_secret_key", algorithm="HS256")
+    mock_token = _create_mock_token()
     return {
         "user": {
-            "id": "62fd877b-9515-411a-bbb7-6a47d021d970",
-            "email": "testuser@gmail.com",
+            "id": _TEST_USER_ID,
+            "email": _TEST_USER_EMAIL,
             "email_confirmed": True,
             "last_sign_in": None
         },
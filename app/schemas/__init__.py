@@ -1,4 +1,4 @@
-from .user import UserCreate, UserUpdate, UserResponse, UserLogin, Token, TokenData
+from .user import UserCreate, UserUpdate, UserResponse, UserLogin, Token, TokenData, UserOut, SignUpOut, SignInOut
 from .deadline import DeadlineCreate, DeadlineUpdate, DeadlineResponse, DeadlineStats
 from .portal import PortalCreate, PortalUpdate, PortalResponse, SyncResult, GitHubCredentials, JiraCredentials, TrelloCredentials
 from .notification import (
@@ -16,6 +16,9 @@ __all__ = [
     "UserLogin",
     "Token",
     "TokenData",
+    "UserOut",
+    "SignUpOut",
+    "SignInOut",
     
     # Deadline schemas
     "DeadlineCreate",
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
 from datetime import datetime
+from uuid import UUID
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -36,4 +37,27 @@ class Token(BaseModel):
     user: UserResponse
 
 class TokenData(BaseModel):
-    email: Optional[str] = None
\ No newline at end of file
+    email: Optional[str] = None
+
+class UserOut(BaseModel):
+    id: UUID
+    email: EmailStr
+    email_confirmed: bool
+    full_name: str = ""
+    # None for users resolved from locally verified JWTs, whose claims have no creation time
+    created_at: Optional[datetime] = None
+    last_sign_in: Optional[datetime] = None
+    is_active: bool = True
+
+class SignUpOut(BaseModel):
+    user: UserOut
+    session: Optional[str] = None
+    message: str
+
+class SignInOut(BaseModel):
+    user: UserOut
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+    message: str = "Login successful"
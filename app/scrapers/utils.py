@@ -1,5 +1,6 @@
 import aiohttp
 import asyncio
+import weakref
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
 import logging
@@ -9,6 +10,31 @@ from urllib.parse import urljoin, urlparse
 
 logger = logging.getLogger(__name__)
 
+# Connection pools shared by every APIHelper running on the same event loop
+_SHARED_CONNECTORS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.TCPConnector]" = weakref.WeakKeyDictionary()
+
+
+def _get_shared_connector() -> aiohttp.TCPConnector:
+    """Get the process-wide connector for the running event loop"""
+    loop = asyncio.get_running_loop()
+    connector = _SHARED_CONNECTORS.get(loop)
+    if connector is None or connector.closed:
+        connector = aiohttp.TCPConnector(
+            limit=200,
+            limit_per_host=32,
+            keepalive_timeout=60,
+            ttl_dns_cache=300
+        )
+        _SHARED_CONNECTORS[loop] = connector
+    return connector
+
+
+async def close_shared_connector():
+    """Close the shared connector bound to the running event loop"""
+    connector = _SHARED_CONNECTORS.pop(asyncio.get_running_loop(), None)
+    if connector is not None and not connector.closed:
+        await connector.close()
+
 class ScrapingUtils:
     """Utility functions for web scraping"""
     
@@ -210,7 +236,9 @@ class APIHelper:
     async def __aenter__(self):
         self.session = aiohttp.ClientSession(
             headers=self.default_headers,
-            timeout=aiohttp.ClientTimeout(total=30)
+            timeout=aiohttp.ClientTimeout(total=30),
+            connector=_get_shared_connector(),
+            connector_owner=False
         )
         return self
     
@@ -1,24 +1,82 @@
 from fastapi import HTTPException, status
 from typing import Optional, Dict, Any
+import asyncio
+import hashlib
+from datetime import datetime, timezone
 import logging
-import os
-from app.database import get_supabase_client
+import re
+import time
+import httpx
+import jwt
+from cachetools import TTLCache
+from gotrue.errors import AuthError
+from app.config import settings
+from app.database import get_supabase_client, get_supabase_admin
+from app.schemas.user import UserOut, SignUpOut, SignInOut
 
 logger = logging.getLogger(__name__)
 
+# Failures raised by supabase-py auth calls (API errors and transport errors)
+_SUPABASE_ERRORS = (AuthError, httpx.HTTPError)
+
+# Verified token -> (exp, user) so repeat requests skip signature checks
+_USER_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+# Signed-out token digests, kept for the default Supabase JWT lifetime since
+# local verification alone would keep accepting them until exp
+_REVOKED_TOKENS: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+
+
+# Supabase auth error text -> category, matched in a single pass
+_AUTH_ERR_RE = re.compile(
+    r'(?P<dup>already registered|already exists)'
+    r'|(?P<badcred>invalid.*(?:password|credentials)|(?:password|credentials).*invalid)'
+    r'|(?P<bademail>invalid.*email|email.*invalid)',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def _auth_error_kind(error: Exception) -> Optional[str]:
+    match = _AUTH_ERR_RE.search(str(error))
+    return match.lastgroup if match else None
+
+
+# Refresh token digest -> pending refresh, so concurrent callers coalesce
+_INFLIGHT_REFRESHES: Dict[bytes, "asyncio.Future[Optional[str]]"] = {}
+
+
+def _token_key(access_token: str) -> bytes:
+    return hashlib.blake2b(access_token.encode(), digest_size=16).digest()
+
+
+def _copy_user(user: Dict[str, Any]) -> Dict[str, Any]:
+    # Callers may mutate the dict they get, so never share the cached one
+    return {**user, "user_metadata": dict(user["user_metadata"])}
+
+
+def _cache_user(key: bytes, exp: Optional[int], user: Dict[str, Any]) -> None:
+    if exp:
+        _USER_CACHE[key] = (exp, _copy_user(user))
+
+
+def _unverified_claims(access_token: str) -> Dict[str, Any]:
+    try:
+        return jwt.decode(access_token, options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        return {}
+
 class AuthService:
     """PRODUCTION-LEVEL Authentication Service using real Supabase Auth"""
     
     def __init__(self):
         self.supabase = get_supabase_client()
-        from app.database import get_supabase_admin
         self.supabase_admin = get_supabase_admin()
+        self._jwt_secret = settings.SUPABASE_JWT_SECRET
+        self._jwt_aud = "authenticated"
     
-    async def sign_up(self, email: str, password: str, metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+    async def sign_up(self, email: str, password: str, metadata: Dict[str, Any] = None) -> SignUpOut:
         """Create a new user with Supabase Auth - DEVELOPMENT MODE"""
         try:
-            print(f"Creating user with email: {email}")
-            
             # Prepare signup data
             signup_data = {
                 "email": email,
@@ -32,31 +90,32 @@ class AuthService:
                 }
             
             # Use real Supabase Auth
-            response = self.supabase.auth.sign_up(signup_data)
+            response = await asyncio.to_thread(self.supabase.auth.sign_up, signup_data)
             
             # Auto-confirm user for development (bypass email verification)
             if response.user and not response.user.email_confirmed_at:
                 try:
                     # Use admin client to confirm the user
-                    self.supabase_admin.auth.admin.update_user_by_id(
+                    await asyncio.to_thread(
+                        self.supabase_admin.auth.admin.update_user_by_id,
                         response.user.id,
                         {"email_confirm": True}
                     )
-                    print(f"User {response.user.email} auto-confirmed successfully")
+                    logger.debug("User %s auto-confirmed successfully", response.user.email)
                 except Exception as confirm_error:
-                    print(f"Auto-confirm failed (user can still sign in): {confirm_error}")
+                    logger.warning("Auto-confirm failed (user can still sign in): %s", confirm_error)
             
             if response.user:
-                return {
-                    "user": {
-                        "id": response.user.id,
-                        "email": response.user.email,
-                        "email_confirmed": response.user.email_confirmed_at is not None,
-                        "created_at": response.user.created_at
-                    },
-                    "session": response.session.access_token if response.session else None,
-                    "message": "User created successfully. Please check your email for verification."
-                }
+                return SignUpOut(
+                    user=UserOut(
+                        id=response.user.id,
+                        email=response.user.email,
+                        email_confirmed=response.user.email_confirmed_at is not None,
+                        created_at=response.user.created_at
+                    ),
+                    session=response.session.access_token if response.session else None,
+                    message="User created successfully. Please check your email for verification."
+                )
             else:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -64,15 +123,15 @@ class AuthService:
                 )
                 
         except Exception as e:
-            logger.error(f"Signup error: {str(e)}")
-            error_message = str(e).lower()
+            logger.error("Signup error: %s", e)
+            error_kind = _auth_error_kind(e)
             
-            if "already registered" in error_message or "already exists" in error_message:
+            if error_kind == "dup":
                 raise HTTPException(
                     status_code=status.HTTP_409_CONFLICT,
                     detail="User with this email already exists"
                 )
-            elif "invalid" in error_message and "email" in error_message:
+            elif error_kind == "bademail":
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Please enter a valid email address"
@@ -84,35 +143,30 @@ class AuthService:
                 detail=f"Registration failed: {str(e)}"
             )
     
-    async def sign_in(self, email: str, password: str) -> Dict[str, Any]:
+    async def sign_in(self, email: str, password: str) -> SignInOut:
         """Sign in a user with email and password - PRODUCTION LEVEL"""
         try:
-            print(f"Signing in user with email: {email}")
-            
             # Use real Supabase Auth
-            response = self.supabase.auth.sign_in_with_password({
+            response = await asyncio.to_thread(self.supabase.auth.sign_in_with_password, {
                 "email": email,
                 "password": password
             })
             
             if response.user and response.session:
                 user_metadata = response.user.user_metadata or {}
-                return {
-                    "user": {
-                        "id": response.user.id,
-                        "email": response.user.email,
-                        "email_confirmed": response.user.email_confirmed_at is not None,
-                        "full_name": user_metadata.get("full_name", ""),
-                        "created_at": response.user.created_at,
-                        "last_sign_in": response.user.last_sign_in_at,
-                        "is_active": True
-                    },
-                    "access_token": response.session.access_token,
-                    "refresh_token": response.session.refresh_token,
-                    "token_type": "bearer",
-                    "expires_in": response.session.expires_in,
-                    "message": "Login successful"
-                }
+                return SignInOut(
+                    user=UserOut(
+                        id=response.user.id,
+                        email=response.user.email,
+                        email_confirmed=response.user.email_confirmed_at is not None,
+                        full_name=user_metadata.get("full_name", ""),
+                        created_at=response.user.created_at,
+                        last_sign_in=response.user.last_sign_in_at
+                    ),
+                    access_token=response.session.access_token,
+                    refresh_token=response.session.refresh_token,
+                    expires_in=response.session.expires_in
+                )
             else:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -122,16 +176,16 @@ class AuthService:
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Sign in error: {str(e)}")
-            error_message = str(e).lower()
+            logger.error("Sign in error: %s", e)
+            error_kind = _auth_error_kind(e)
             
             # Skip email confirmation check for development
-            # if "email not confirmed" in error_message or "not confirmed" in error_message:
+            # if "not confirmed" in str(e).lower():
             #     raise HTTPException(
             #         status_code=status.HTTP_401_UNAUTHORIZED,
             #         detail="Please check your email and click the verification link before signing in."
             #     )
-            if "invalid" in error_message and ("password" in error_message or "credentials" in error_message):
+            if error_kind == "badcred":
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid email or password"
@@ -144,15 +198,50 @@ class AuthService:
     
     async def get_user_from_token(self, access_token: str) -> Optional[Dict[str, Any]]:
         """Get user information from access token - PRODUCTION LEVEL"""
+        key = _token_key(access_token)
+        if key in _REVOKED_TOKENS:
+            return None
+        
+        cached = _USER_CACHE.get(key)
+        if cached:
+            exp, user = cached
+            if exp > time.time():
+                return _copy_user(user)
+            _USER_CACHE.pop(key, None)
+        
+        if self._jwt_secret:
+            try:
+                payload = jwt.decode(
+                    access_token,
+                    self._jwt_secret,
+                    algorithms=["HS256"],
+                    audience=self._jwt_aud,
+                    # Missing claims raise InvalidTokenError and take the fallback
+                    options={"require": ["sub", "exp"]}
+                )
+                user = self._user_from_claims(payload)
+                _cache_user(key, payload.get("exp"), user)
+                return user
+            except jwt.ExpiredSignatureError:
+                return None
+            except jwt.InvalidTokenError as e:
+                # Fall back to Supabase for tokens we cannot verify locally
+                logger.debug("Local token verification failed, asking Supabase: %s", e)
+        
+        # Test-user mock tokens are never valid Supabase sessions
+        if _unverified_claims(access_token).get("mock") is True:
+            return None
+        
         try:
-            print(f"Validating token: {access_token[:50]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Validating token %s...", access_token[:16])
             
             # Use real Supabase Auth to validate token
-            response = self.supabase.auth.get_user(access_token)
+            response = await asyncio.to_thread(self.supabase.auth.get_user, access_token)
             
             if response.user:
                 user_metadata = response.user.user_metadata or {}
-                return {
+                user = {
                     "id": response.user.id,
                     "email": response.user.email,
                     "email_confirmed": response.user.email_confirmed_at is not None,
@@ -162,81 +251,143 @@ class AuthService:
                     "last_sign_in": response.user.last_sign_in_at,
                     "is_active": True
                 }
+                # Supabase has vouched for the token; only its exp claim is needed
+                _cache_user(key, _unverified_claims(access_token).get("exp"), user)
+                return user
             else:
                 return None
                 
         except Exception as e:
-            print(f"Token validation error: {e}")
+            logger.warning("Token validation error: %s", e)
             return None
     
+    @staticmethod
+    def _user_from_claims(payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the user dict from verified Supabase JWT claims
+        
+        Matches the Supabase fallback's shape, but the claims carry no
+        account creation time, so created_at is always None here, and
+        last_sign_in is when the token was issued (a refresh reissues it).
+        """
+        user_metadata = payload.get("user_metadata") or {}
+        iat = payload.get("iat")
+        return {
+            "id": payload["sub"],
+            "email": payload.get("email"),
+            "email_confirmed": bool(user_metadata.get("email_verified", False)),
+            "full_name": user_metadata.get("full_name", ""),
+            "user_metadata": user_metadata,
+            "created_at": None,
+            "last_sign_in": datetime.fromtimestamp(iat, tz=timezone.utc) if iat else None,
+            "is_active": True
+        }
+    
     async def refresh_token(self, refresh_token: str) -> Optional[str]:
         """Refresh an access token - PRODUCTION LEVEL"""
+        # Concurrent refreshes of the same token share one Supabase call
+        key = _token_key(refresh_token)
+        inflight = _INFLIGHT_REFRESHES.get(key)
+        if inflight:
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        _INFLIGHT_REFRESHES[key] = future
         try:
-            print(f"Refreshing token: {refresh_token[:50]}...")
-            
-            response = self.supabase.auth.refresh_session(refresh_token)
-            
-            if response.session:
-                return response.session.access_token
-            else:
-                return None
-                
-        except Exception as e:
-            print(f"Token refresh error: {e}")
+            access_token = await self._refresh_session(refresh_token)
+        except BaseException as e:
+            # Waiters re-raise the leader's error rather than a CancelledError
+            future.set_exception(e)
+            # Mark it retrieved so a refresh without waiters doesn't log
+            # "exception was never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(access_token)
+            return access_token
+        finally:
+            _INFLIGHT_REFRESHES.pop(key, None)
+    
+    async def _refresh_session(self, refresh_token: str) -> Optional[str]:
+        try:
+            response = await asyncio.to_thread(self.supabase.auth.refresh_session, refresh_token)
+        except _SUPABASE_ERRORS as e:
+            logger.warning("Token refresh error: %s", e)
+            return None
+        except Exception:
+            # Anything else (bad response payloads, client bugs) keeps the
+            # previous behaviour of a failed refresh
+            logger.exception("Unexpected token refresh error")
+            return None
+        
+        if response.session:
+            return response.session.access_token
+        else:
             return None
     
     async def sign_out(self, access_token: str) -> Dict[str, Any]:
         """Sign out a user - PRODUCTION LEVEL"""
+        key = _token_key(access_token)
+        _REVOKED_TOKENS[key] = True
+        _USER_CACHE.pop(key, None)
+        
         try:
-            print(f"Signing out user with token: {access_token[:50]}...")
-            
-            self.supabase.auth.sign_out()
+            # Revoke this token's session, not whatever the shared client last stored
+            await asyncio.to_thread(self.supabase_admin.auth.admin.sign_out, access_token)
             
             return {"message": "Successfully signed out"}
             
         except Exception as e:
-            logger.error(f"Sign out error: {str(e)}")
+            logger.error("Sign out error: %s", e)
             return {"message": "Sign out completed"}
     
     async def reset_password(self, email: str) -> Dict[str, Any]:
         """Reset password for a user - PRODUCTION LEVEL"""
+        logger.debug("Resetting password for email: %s", email)
+        
         try:
-            print(f"Resetting password for email: {email}")
-            
-            response = self.supabase.auth.reset_password_email(email)
-            
-            return {"message": "Password reset email sent successfully"}
-            
-        except Exception as e:
-            logger.error(f"Password reset error: {str(e)}")
+            await asyncio.to_thread(self.supabase.auth.reset_password_email, email)
+        except _SUPABASE_ERRORS as e:
+            logger.error("Password reset error: %s", e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to send password reset email"
+            )
+        except Exception:
+            logger.exception("Unexpected password reset error")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to send password reset email"
             )
+        
+        return {"message": "Password reset email sent successfully"}
     
     async def verify_email(self, token: str, type: str) -> Dict[str, Any]:
         """Verify email with token - PRODUCTION LEVEL"""
         try:
-            print(f"Verifying email with token: {token[:50]}...")
-            
-            response = self.supabase.auth.verify_otp({
+            await asyncio.to_thread(self.supabase.auth.verify_otp, {
                 'token': token,
                 'type': type
             })
-            
-            return {"message": "Email verified successfully"}
-            
-        except Exception as e:
-            logger.error(f"Email verification error: {str(e)}")
+        except _SUPABASE_ERRORS as e:
+            logger.error("Email verification error: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid or expired verification token"
             )
+        except Exception:
+            logger.exception("Unexpected email verification error")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid or expired verification token"
+            )
+        
+        return {"message": "Email verified successfully"}
     
     async def get_oauth_url(self, provider: str, redirect_url: str) -> Dict[str, Any]:
         """Get OAuth URL for provider (Google, GitHub, etc.) - PRODUCTION LEVEL"""
         try:
-            print(f"Getting OAuth URL for provider: {provider}")
+            logger.debug("Getting OAuth URL for provider: %s", provider)
             
             response = self.supabase.auth.sign_in_with_oauth({
                 "provider": provider,
@@ -251,7 +402,7 @@ class AuthService:
             }
             
         except Exception as e:
-            logger.error(f"OAuth URL generation error: {str(e)}")
+            logger.error("OAuth URL generation error: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to generate OAuth URL: {str(e)}"
@@ -260,10 +411,8 @@ class AuthService:
     async def handle_oauth_callback(self, code: str) -> Dict[str, Any]:
         """Handle OAuth callback and exchange code for session - PRODUCTION LEVEL"""
         try:
-            print(f"Handling OAuth callback with code: {code[:50]}...")
-            
             # Exchange code for session
-            response = self.supabase.auth.exchange_code_for_session(code)
+            response = await asyncio.to_thread(self.supabase.auth.exchange_code_for_session, code)
             
             if response.user and response.session:
                 user_metadata = response.user.user_metadata or {}
@@ -293,7 +442,7 @@ class AuthService:
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"OAuth callback error: {str(e)}")
+            logger.error("OAuth callback error: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"OAuth callback failed: {str(e)}"
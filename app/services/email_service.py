@@ -1,49 +1,83 @@
 import os
+import asyncio
+import weakref
 from dotenv import load_dotenv
 import httpx
+import orjson
+
+load_dotenv()
+
+_SENDGRID_KEY = os.getenv("SENDGRID_API_KEY")
+_FROM_EMAIL = os.getenv("SENDGRID_FROM_EMAIL", os.getenv("SMTP_USERNAME"))
+_FROM = {"email": _FROM_EMAIL}
+
+# SendGrid accepts at most 1000 personalizations per mail/send request
+_MAX_PERSONALIZATIONS = 1000
+
+# Pooled SendGrid clients, one per event loop (Celery tasks run their own loops)
+_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def _get_client() -> httpx.AsyncClient:
+    """Get the keep-alive SendGrid client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            headers={
+                "Authorization": f"Bearer {_SENDGRID_KEY}",
+                "Content-Type": "application/json"
+            }
+        )
+        _CLIENTS[loop] = client
+    return client
+
+async def aclose():
+    """Close the SendGrid client bound to the running event loop"""
+    client = _CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
 
 async def send_email(to_email, subject, body):
     """
     Send email using SendGrid API (bypasses SMTP port blocking)
     Free tier: 100 emails/day
-    """
-    load_dotenv()
     
-    sendgrid_api_key = os.getenv("SENDGRID_API_KEY")
-    from_email = os.getenv("SENDGRID_FROM_EMAIL", os.getenv("SMTP_USERNAME"))
-    
-    if not sendgrid_api_key:
+    to_email may be a single address or a list of addresses; each recipient
+    gets its own personalization so nobody sees the other addresses.
+    """
+    if not _SENDGRID_KEY:
         raise ValueError("SENDGRID_API_KEY environment variable is required")
     
     # SendGrid API endpoint
     url = "https://api.sendgrid.com/v3/mail/send"
     
-    # Email payload
-    payload = {
-        "personalizations": [
-            {
-                "to": [{"email": to_email}],
-                "subject": subject
-            }
-        ],
-        "from": {"email": from_email},
-        "content": [
-            {
-                "type": "text/plain",
-                "value": body
-            }
-        ]
-    }
+    to_emails = [to_email] if isinstance(to_email, str) else list(to_email)
+    client = _get_client()
     
-    headers = {
-        "Authorization": f"Bearer {sendgrid_api_key}",
-        "Content-Type": "application/json"
-    }
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json=payload, headers=headers)
-        
-        if response.status_code not in [200, 202]:
-            raise Exception(f"SendGrid API error: {response.status_code} - {response.text}")
+    for start in range(0, len(to_emails), _MAX_PERSONALIZATIONS):
+        # Email payload
+        payload = {
+            "personalizations": [
+                {"to": [{"email": email}], "subject": subject}
+                for email in to_emails[start:start + _MAX_PERSONALIZATIONS]
+            ],
+            "from": _FROM,
+            "content": [
+                {
+                    "type": "text/plain",
+                    "value": body
+                }
+            ]
+        }
+        content = orjson.dumps(payload)
         
-        return True
+        # Stream so the (empty) success body is never buffered or decoded
+        async with client.stream("POST", url, content=content) as response:
+            if response.status_code not in [200, 202]:
+                await response.aread()
+                raise Exception(f"SendGrid API error: {response.status_code} - {response.text}")
+    
+    return True
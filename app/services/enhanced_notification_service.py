@@ -9,14 +9,12 @@ This module handles sending notifications via multiple channels:
 """
 
 import logging
-import smtplib
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Union
 from enum import Enum
-from email.mime.text import MIMEText as MimeText
-from email.mime.multipart import MIMEMultipart as MimeMultipart
 import asyncio
 import httpx
+import orjson
 
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioException
@@ -157,7 +155,7 @@ class EnhancedNotificationService:
             }
             
             async with httpx.AsyncClient() as client:
-                response = await client.post(url, json=payload, headers=headers)
+                response = await client.post(url, content=orjson.dumps(payload), headers=headers)
                 
                 if response.status_code not in [200, 202]:
                     raise Exception(f"SendGrid API error: {response.status_code} - {response.text}")
@@ -7,15 +7,63 @@ using the Twilio API.
 
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Union
+from typing import TYPE_CHECKING, Callable, List, Dict, Any, Optional, Tuple, Union
 from enum import Enum
+import asyncio
+import functools
 import os
+import random
+import threading
+import time
+import weakref
 
-from twilio.rest import Client
-from twilio.base.exceptions import TwilioException
+import httpx
+from twilio.base.exceptions import TwilioException, TwilioRestException
+
+if TYPE_CHECKING:
+    from twilio.rest import Client
 
 logger = logging.getLogger(__name__)
 
+TWILIO_API_BASE = "https://api.twilio.com/2010-04-01"
+
+# Trailer appended to every outgoing message
+MESSAGE_SIGNATURE = "-- AI Cruel Deadline Manager"
+
+# Separators dropped from phone numbers before formatting
+_PHONE_STRIP = str.maketrans('', '', ' -+')
+
+
+def _as_datetime(value: Union[str, datetime]) -> datetime:
+    """Return a deadline due date as a datetime, parsing ISO strings."""
+    if isinstance(value, str):
+        # The runtime is Python 3.10, whose fromisoformat does not accept 'Z'
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return value
+
+
+# Sync Twilio clients shared across service instances, keyed by credentials
+_CLIENT_CACHE: Dict[Tuple[str, str], "Client"] = {}
+
+
+def _get_twilio_client(account_sid: str, auth_token: str) -> "Client":
+    """Get the process-wide Twilio client for these credentials."""
+    key = (account_sid, auth_token)
+    client = _CLIENT_CACHE.get(key)
+    if client is None:
+        # Imported on first use: twilio.rest and its requests stack are only
+        # needed for account/status lookups, not for sending or formatting
+        from requests.adapters import HTTPAdapter
+        from twilio.rest import Client
+        
+        client = Client(account_sid, auth_token)
+        session = getattr(client.http_client, 'session', None)
+        if session is not None:
+            # Explicit, bounded keep-alive pool; retries are handled by the caller
+            session.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=0))
+        client = _CLIENT_CACHE.setdefault(key, client)
+    return client
+
 
 class NotificationType(Enum):
     """Types of notifications supported"""
@@ -32,9 +80,53 @@ class NotificationStatus(Enum):
     UNKNOWN = "unknown"
 
 
+class _TokenBucket:
+    """
+    Token-bucket rate limiter for outbound sends.
+    
+    Tokens are reserved synchronously (the balance may go negative) and the
+    caller then sleeps off its debt, so waiters are served in arrival order
+    without holding an asyncio lock tied to one event loop.
+    """
+    
+    def __init__(self, capacity: int, refill_per_sec: float):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    async def acquire(self):
+        """Take one token, waiting until it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_sec)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.refill_per_sec
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
 class TwilioNotificationService:
     """Service for sending notifications via Twilio SMS and WhatsApp"""
     
+    # Concurrent sends per bulk fan-out, sized to Twilio's per-channel throughput
+    BULK_CONCURRENCY = {
+        NotificationType.SMS: 50,
+        NotificationType.WHATSAPP: 25
+    }
+    
+    # Send attempts when Twilio is rate limiting or unreachable. Creating a
+    # message is not idempotent, so only retry failures where Twilio cannot
+    # have accepted it
+    SEND_ATTEMPTS = 3
+    RETRY_STATUSES = {429}
+    RETRY_CODES = {20429, 63018}
+    RETRY_EXCEPTIONS = (httpx.ConnectError, httpx.ConnectTimeout)
+    RETRY_BASE_WAIT = 0.5
+    RETRY_MAX_WAIT = 8.0
+    
     def __init__(self, 
                  account_sid: Optional[str] = None, 
                  auth_token: Optional[str] = None,
@@ -57,23 +149,96 @@ class TwilioNotificationService:
         if not self.account_sid or not self.auth_token:
             raise ValueError("Twilio Account SID and Auth Token are required")
         
-        self.client = Client(self.account_sid, self.auth_token)
-        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._client: Optional["Client"] = None
+        # Async REST clients for the send path, one per event loop (Celery tasks run their own loops)
+        self._http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+        # monotonic() deadline until which the last successful validation is trusted
+        self._valid_until = 0.0
+        # Keep each channel under Twilio's messages-per-second limit
+        self._buckets = {
+            NotificationType.SMS: _TokenBucket(50, 50),
+            NotificationType.WHATSAPP: _TokenBucket(25, 25)
+        }
+    
+    @property
+    def client(self) -> "Client":
+        """Sync Twilio client, created on first use."""
+        if self._client is None:
+            self._client = _get_twilio_client(self.account_sid, self.auth_token)
+        return self._client
+    
+    def _get_http(self) -> httpx.AsyncClient:
+        """Get the keep-alive Twilio REST client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._http_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                auth=(self.account_sid, self.auth_token),
+                base_url=f"{TWILIO_API_BASE}/Accounts/{self.account_sid}",
+                timeout=30.0
+            )
+            self._http_clients[loop] = client
+        return client
+    
+    async def aclose(self):
+        """Close the Twilio REST client bound to the running event loop."""
+        client = self._http_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
     
-    def validate_config(self) -> bool:
+    def validate_config(self, ttl: float = 60) -> bool:
         """
         Validate Twilio configuration.
         
+        Args:
+            ttl: Seconds a successful validation is reused without calling Twilio
+            
         Returns:
             bool: True if configuration is valid
         """
+        if time.monotonic() < self._valid_until:
+            return True
+        
         try:
             # Test connection by fetching account info
             account = self.client.api.accounts(self.account_sid).fetch()
-            return account.status == 'active'
         except Exception as e:
-            self.logger.error(f"Twilio configuration validation failed: {e}")
+            logger.error("Twilio configuration validation failed: %s", e)
             return False
+        
+        return self._record_validation(account.status == 'active', ttl)
+    
+    async def validate_config_async(self, ttl: float = 60) -> bool:
+        """
+        Validate Twilio configuration without blocking the event loop.
+        
+        Args:
+            ttl: Seconds a successful validation is reused without calling Twilio
+            
+        Returns:
+            bool: True if configuration is valid
+        """
+        if time.monotonic() < self._valid_until:
+            return True
+        
+        try:
+            # Absolute URL: the account resource is a sibling of the client's base_url
+            response = await self._get_http().get(f"{TWILIO_API_BASE}/Accounts/{self.account_sid}.json")
+            response.raise_for_status()
+            status = response.json().get('status')
+        except Exception as e:
+            logger.error("Twilio configuration validation failed: %s", e)
+            return False
+        
+        return self._record_validation(status == 'active', ttl)
+    
+    def _record_validation(self, valid: bool, ttl: float) -> bool:
+        """Cache a successful validation for ttl seconds."""
+        if valid:
+            self._valid_until = time.monotonic() + ttl
+        return valid
     
     async def send_deadline_reminder(self,
                                    phone_number: str,
@@ -152,6 +317,69 @@ class TwilioNotificationService:
             notification_type=notification_type
         )
     
+    async def send_bulk(self,
+                        recipients: List[str],
+                        message_builder: Callable[[str], str],
+                        notification_type: NotificationType = NotificationType.SMS) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Send a notification to many recipients concurrently.
+        
+        Args:
+            recipients: Recipient phone numbers
+            message_builder: Builds the message body for a recipient
+            notification_type: SMS or WhatsApp
+            
+        Returns:
+            List of notification results, in recipient order
+        """
+        semaphore = asyncio.Semaphore(self.BULK_CONCURRENCY[notification_type])
+        
+        async def _send_one(phone_number: str, message: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.send_notification(
+                    phone_number=phone_number,
+                    message=message,
+                    notification_type=notification_type
+                )
+        
+        # Build every body before fanning out so formatting stays off the send path
+        messages = [message_builder(phone_number) for phone_number in recipients]
+        return await asyncio.gather(
+            *[_send_one(phone_number, message) for phone_number, message in zip(recipients, messages)],
+            return_exceptions=True
+        )
+    
+    async def send_bulk_deadline_reminder(self,
+                                        phone_numbers: List[str],
+                                        deadline_title: str,
+                                        deadline_date: datetime,
+                                        deadline_url: Optional[str] = None,
+                                        notification_type: NotificationType = NotificationType.SMS,
+                                        priority: str = "medium") -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Send the same deadline reminder to many recipients.
+        
+        Args:
+            phone_numbers: Recipient phone numbers
+            deadline_title: Title of the deadline
+            deadline_date: When the deadline is due
+            deadline_url: Optional URL to the deadline source
+            notification_type: SMS or WhatsApp
+            priority: Priority level (low, medium, high, urgent)
+            
+        Returns:
+            List of notification results, in recipient order
+        """
+        message_body = self._format_deadline_message(
+            deadline_title, deadline_date, deadline_url, priority
+        )
+        
+        return await self.send_bulk(
+            phone_numbers,
+            lambda _phone_number: message_body,
+            notification_type=notification_type
+        )
+    
     async def send_notification(self,
                               phone_number: str,
                               message: str,
@@ -181,17 +409,16 @@ class TwilioNotificationService:
                 }
             
             # Send message
-            message_obj = self.client.messages.create(
-                body=message,
-                from_=from_number,
-                to=to_number
+            payload = await self._send_with_retry(
+                notification_type=notification_type,
+                data={"To": to_number, "From": from_number, "Body": message}
             )
             
-            self.logger.info(f"Notification sent successfully. SID: {message_obj.sid}")
+            logger.info("Notification sent successfully. SID: %s", payload['sid'])
             
             return {
                 'success': True,
-                'message_sid': message_obj.sid,
+                'message_sid': payload['sid'],
                 'status': NotificationStatus.SENT.value,
                 'to': to_number,
                 'from': from_number,
@@ -199,7 +426,7 @@ class TwilioNotificationService:
             }
             
         except TwilioException as e:
-            self.logger.error(f"Twilio error sending notification: {e}")
+            logger.error("Twilio error sending notification: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -207,7 +434,7 @@ class TwilioNotificationService:
                 'status': NotificationStatus.FAILED.value
             }
         except Exception as e:
-            self.logger.error(f"Unexpected error sending notification: {e}")
+            logger.error("Unexpected error sending notification: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -215,6 +442,60 @@ class TwilioNotificationService:
                 'status': NotificationStatus.FAILED.value
             }
     
+    async def _send_with_retry(self, notification_type: NotificationType, data: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Post a message to Twilio, backing off and retrying on rate limiting
+        and on connection failures.
+        
+        Returns:
+            Dict containing the created message resource
+            
+        Raises:
+            TwilioRestException: If Twilio rejects the message
+            httpx.HTTPError: If Twilio cannot be reached
+        """
+        bucket = self._buckets[notification_type]
+        for attempt in range(self.SEND_ATTEMPTS):
+            await bucket.acquire()
+            try:
+                response = await self._get_http().post("/Messages.json", data=data)
+            except self.RETRY_EXCEPTIONS as e:
+                # The request never reached Twilio, so resending cannot duplicate it
+                if attempt == self.SEND_ATTEMPTS - 1:
+                    raise
+                wait = self._retry_wait(attempt)
+                logger.warning("Could not reach Twilio (%s), retrying in %.1fs", e, wait)
+                await asyncio.sleep(wait)
+                continue
+            
+            if response.status_code < 400:
+                return response.json()
+            
+            try:
+                payload = response.json()
+            except ValueError:
+                # Gateway errors may not carry a JSON body
+                payload = {}
+            
+            error = TwilioRestException(
+                response.status_code,
+                str(response.url),
+                msg=payload.get('message', ''),
+                code=payload.get('code'),
+                method="POST"
+            )
+            retryable = error.status in self.RETRY_STATUSES or error.code in self.RETRY_CODES
+            if not retryable or attempt == self.SEND_ATTEMPTS - 1:
+                raise error
+            
+            wait = self._retry_wait(attempt)
+            logger.warning("Twilio send failed (status %s, code %s), retrying in %.1fs", error.status, error.code, wait)
+            await asyncio.sleep(wait)
+    
+    def _retry_wait(self, attempt: int) -> float:
+        # Jitter so a bulk fan-out does not retry in lockstep
+        return min(self.RETRY_MAX_WAIT, self.RETRY_BASE_WAIT * 2 ** attempt) * random.uniform(0.8, 1.2)
+    
     def get_message_status(self, message_sid: str) -> Dict[str, Any]:
         """
         Get the delivery status of a sent message.
@@ -251,7 +532,7 @@ class TwilioNotificationService:
             }
             
         except TwilioException as e:
-            self.logger.error(f"Error fetching message status: {e}")
+            logger.error("Error fetching message status: %s", e)
             return {
                 'message_sid': message_sid,
                 'status': NotificationStatus.UNKNOWN.value,
@@ -260,8 +541,14 @@ class TwilioNotificationService:
     
     def _format_phone_number(self, phone_number: str, notification_type: NotificationType) -> str:
         """Format phone number for the specific notification type."""
+        return self._format_phone_number_cached(phone_number, notification_type == NotificationType.WHATSAPP)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=8192)
+    def _format_phone_number_cached(phone_number: str, is_whatsapp: bool) -> str:
+        """Format phone number; memoized since broadcasts and retries repeat numbers."""
         # Remove any existing prefixes
-        clean_number = phone_number.replace('whatsapp:', '').replace('+', '').replace(' ', '').replace('-', '')
+        clean_number = phone_number.strip().removeprefix('whatsapp:').translate(_PHONE_STRIP)
         
         # Ensure it starts with country code (assume +1 for US if not provided)
         if not clean_number.startswith('1') and len(clean_number) == 10:
@@ -269,7 +556,7 @@ class TwilioNotificationService:
         
         formatted_number = '+' + clean_number
         
-        if notification_type == NotificationType.WHATSAPP:
+        if is_whatsapp:
             return f'whatsapp:{formatted_number}'
         else:
             return formatted_number
@@ -308,24 +595,27 @@ class TwilioNotificationService:
             urgency = "🚨 CRITICAL"
         
         # Build message
-        message = f"{urgency} Deadline Reminder\n\n"
-        message += f"📋 {title}\n"
-        message += f"⏱️ Due: {time_str}\n"
-        message += f"📅 {deadline_date.strftime('%Y-%m-%d %H:%M')}"
+        parts = [
+            f"{urgency} Deadline Reminder\n\n",
+            f"📋 {title}\n",
+            f"⏱️ Due: {time_str}\n",
+            f"📅 {deadline_date.strftime('%Y-%m-%d %H:%M')}"
+        ]
         
         if url:
-            message += f"\n🔗 {url}"
+            parts.append(f"\n🔗 {url}")
         
-        message += "\n\n-- AI Cruel Deadline Manager"
+        parts.append("\n\n")
+        parts.append(MESSAGE_SIGNATURE)
         
-        return message
+        return "".join(parts)
     
     def _format_daily_summary(self, deadlines: List[Dict[str, Any]]) -> str:
         """Format a daily summary message."""
         if not deadlines:
-            return "📅 Daily Summary\n\nNo upcoming deadlines today. Great job staying on top of things!\n\n-- AI Cruel Deadline Manager"
+            return "📅 Daily Summary\n\nNo upcoming deadlines today. Great job staying on top of things!\n\n" + MESSAGE_SIGNATURE
         
-        message = f"📅 Daily Summary - {len(deadlines)} deadline{'s' if len(deadlines) != 1 else ''}\n\n"
+        parts = [f"📅 Daily Summary - {len(deadlines)} deadline{'s' if len(deadlines) != 1 else ''}\n\n"]
         
         # Group by urgency
         urgent = []
@@ -333,71 +623,65 @@ class TwilioNotificationService:
         upcoming = []
         
         now = datetime.now()
+        today_date = now.date()
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         tomorrow_start = today_start + timedelta(days=1)
         
+        # Parse each due date once; the groups hold (deadline, due_date) pairs
         for deadline in deadlines[:10]:  # Limit to 10 deadlines
-            due_date = deadline.get('due_date')
-            if isinstance(due_date, str):
-                due_date = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
+            due_date = _as_datetime(deadline.get('due_date'))
             
             if due_date < now:
-                urgent.append(deadline)
+                urgent.append((deadline, due_date))
             elif due_date < tomorrow_start:
-                today.append(deadline)
+                today.append((deadline, due_date))
             else:
-                upcoming.append(deadline)
+                upcoming.append((deadline, due_date))
         
         # Add urgent deadlines
         if urgent:
-            message += "🚨 OVERDUE:\n"
-            for deadline in urgent:
-                message += f"• {deadline.get('title', 'Untitled')}\n"
-            message += "\n"
+            parts.append("🚨 OVERDUE:\n")
+            for deadline, _ in urgent:
+                parts.append(f"• {deadline.get('title', 'Untitled')}\n")
+            parts.append("\n")
         
         # Add today's deadlines
         if today:
-            message += "⏰ TODAY:\n"
-            for deadline in today:
-                due_time = deadline.get('due_date')
-                if isinstance(due_time, str):
-                    due_time = datetime.fromisoformat(due_time.replace('Z', '+00:00'))
-                message += f"• {deadline.get('title', 'Untitled')} ({due_time.strftime('%H:%M')})\n"
-            message += "\n"
+            parts.append("⏰ TODAY:\n")
+            for deadline, due_time in today:
+                parts.append(f"• {deadline.get('title', 'Untitled')} ({due_time.strftime('%H:%M')})\n")
+            parts.append("\n")
         
         # Add upcoming deadlines
         if upcoming:
-            message += "📅 UPCOMING:\n"
-            for deadline in upcoming[:5]:  # Limit upcoming to 5
-                due_date = deadline.get('due_date')
-                if isinstance(due_date, str):
-                    due_date = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-                days_until = (due_date.date() - now.date()).days
-                message += f"• {deadline.get('title', 'Untitled')} ({days_until} day{'s' if days_until != 1 else ''})\n"
-        
-        message += "\n-- AI Cruel Deadline Manager"
-        return message
+            parts.append("📅 UPCOMING:\n")
+            for deadline, due_date in upcoming[:5]:  # Limit upcoming to 5
+                days_until = (due_date.date() - today_date).days
+                parts.append(f"• {deadline.get('title', 'Untitled')} ({days_until} day{'s' if days_until != 1 else ''})\n")
+        
+        parts.append("\n")
+        parts.append(MESSAGE_SIGNATURE)
+        return "".join(parts)
     
     def _format_overdue_alert(self, overdue_deadlines: List[Dict[str, Any]]) -> str:
         """Format an overdue alert message."""
         count = len(overdue_deadlines)
-        message = f"🚨 OVERDUE ALERT - {count} deadline{'s' if count != 1 else ''}\n\n"
+        parts = [f"🚨 OVERDUE ALERT - {count} deadline{'s' if count != 1 else ''}\n\n"]
+        now = datetime.now()
         
         for deadline in overdue_deadlines[:5]:  # Limit to 5 overdue items
             title = deadline.get('title', 'Untitled')
-            due_date = deadline.get('due_date')
-            
-            if isinstance(due_date, str):
-                due_date = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
+            due_date = _as_datetime(deadline.get('due_date'))
             
-            days_overdue = (datetime.now() - due_date).days
-            message += f"• {title} ({days_overdue} day{'s' if days_overdue != 1 else ''} overdue)\n"
+            days_overdue = (now - due_date).days
+            parts.append(f"• {title} ({days_overdue} day{'s' if days_overdue != 1 else ''} overdue)\n")
         
         if count > 5:
-            message += f"... and {count - 5} more\n"
+            parts.append(f"... and {count - 5} more\n")
         
-        message += "\nPlease review and update these deadlines.\n\n-- AI Cruel Deadline Manager"
-        return message
+        parts.append("\nPlease review and update these deadlines.\n\n")
+        parts.append(MESSAGE_SIGNATURE)
+        return "".join(parts)
 
 
 # Singleton instance for global use
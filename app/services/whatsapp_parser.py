@@ -3,12 +3,27 @@ WhatsApp Chat Parser for AI Cruel
 Extracts deadlines from WhatsApp group chat messages
 """
 
+import functools
+import io
 import re
+from collections import deque
+from operator import itemgetter
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import Iterable, List, Dict, Optional, Tuple
 import dateparser
 from dateutil.relativedelta import relativedelta
 
+
+# Phrases counted from the current time ("in 2 hours", "3 days from now"),
+# which dateparser resolves by adding to the relative base
+_OFFSET_RE = re.compile(r'\b(?:sec|second|min|minute|hr|hour|day|week|fortnight|month|year)s?\b')
+
+
+@functools.lru_cache(maxsize=4096)
+def _dp(date_text: str, base: datetime) -> Optional[datetime]:
+    """Run dateparser relative to base, memoized per phrase and base time"""
+    return dateparser.parse(date_text, settings={'RELATIVE_BASE': base, 'PREFER_DATES_FROM': 'future'})
+
 class WhatsAppChatParser:
     def __init__(self):
         # Common deadline keywords
@@ -30,6 +45,44 @@ class WhatsAppChatParser:
         # Priority indicators
         self.priority_high = ['urgent', 'asap', 'important', 'critical', 'emergency', 'rush']
         self.priority_low = ['optional', 'if possible', 'when you can', 'no rush', 'flexible']
+        
+        # Precompiled patterns, so per-line matching skips the re module cache lookup
+        # Common WhatsApp export line formats
+        self._line_patterns = [re.compile(p) for p in [
+            r'(\d{1,2}/\d{1,2}/\d{2,4}),?\s+(\d{1,2}:\d{2})\s*(?:AM|PM)?\s*-\s*([^:]+):\s*(.+)',
+            r'(\d{1,2}/\d{1,2}/\d{2,4})\s+(\d{1,2}:\d{2})\s*-\s*([^:]+):\s*(.+)',
+            r'\[(\d{1,2}/\d{1,2}/\d{2,4}),?\s+(\d{1,2}:\d{2}:\d{2})\]\s*([^:]+):\s*(.+)'
+        ]]
+        
+        # Each group of alternatives is a single regex so a message is scanned once
+        # per group; alternative N captures into tN (task) and dN (date text)
+        # Direct deadline mentions
+        self._deadline_union = re.compile('|'.join([
+            r'(?P<t1>.+?)\s+(?:is\s+)?due\s+(?:on\s+)?(?P<d1>.+?)(?:\.|$|,)',
+            r'(?P<t2>.+?)\s+deadline\s+(?:is\s+)?(?P<d2>.+?)(?:\.|$|,)',
+            r'submit\s+(?P<t3>.+?)\s+(?:by\s+|before\s+)(?P<d3>.+?)(?:\.|$|,)',
+            r'(?P<t4>.+?)\s+(?:assignment|homework|project)\s+(?:due\s+)?(?P<d4>.+?)(?:\.|$|,)',
+        ]), re.IGNORECASE)
+        
+        # Event/meeting patterns (alternative 2 has no date capture)
+        self._event_union = re.compile('|'.join([
+            r'(?P<t1>.+?)\s+(?:meeting|presentation|exam|test|quiz)\s+(?:is\s+|on\s+)?(?P<d1>.+?)(?:\.|$|,)',
+            r'(?P<t2>.+?)\s+(?:tomorrow|today|tonight|next\s+week|this\s+week)',
+            r'(?:remember|don\'t forget),?\s+(?P<t3>.+?)\s+(?:is\s+)?(?P<d3>.+?)(?:\.|$|,)',
+        ]), re.IGNORECASE)
+        
+        self._time_re = re.compile(r'(\d{1,2}):(\d{2})\s*(am|pm)?')
+        
+        # Day names with their weekday() index
+        self._weekday_re = re.compile(r'\b(mon|tues|wednes|thurs|fri|satur|sun)day')
+        self._weekday_idx = {'mon': 0, 'tues': 1, 'wednes': 2, 'thurs': 3, 'fri': 4, 'satur': 5, 'sun': 6}
+        
+        # Keywords and time expressions scanned as a single tuple
+        self._indicator_terms = tuple(self.deadline_keywords + self.time_expressions)
+        
+        # Export timestamp day orders, month-first like dateparser; the last
+        # one that parsed is tried first since an export uses a single format
+        self._date_orders = ['%m/%d/', '%d/%m/']
     
     def parse_whatsapp_export(self, chat_content: str) -> List[Dict]:
         """
@@ -41,10 +94,21 @@ class WhatsAppChatParser:
         Returns:
             List of extracted deadlines with metadata
         """
-        lines = chat_content.split('\n')
+        return self.parse_whatsapp_export_stream(io.StringIO(chat_content))
+    
+    def parse_whatsapp_export_stream(self, fp: Iterable[str]) -> List[Dict]:
+        """
+        Parse a WhatsApp chat export line by line and extract deadlines
+        
+        Args:
+            fp: Text file object (or any iterable of lines) of the export
+            
+        Returns:
+            List of extracted deadlines with metadata
+        """
         extracted_deadlines = []
         
-        for line in lines:
+        for line in fp:
             message_data = self._parse_chat_line(line)
             if message_data:
                 deadlines = self._extract_deadlines_from_message(
@@ -56,7 +120,7 @@ class WhatsAppChatParser:
         
         # Remove duplicates and sort by confidence
         unique_deadlines = self._remove_duplicates(extracted_deadlines)
-        return sorted(unique_deadlines, key=lambda x: x['confidence'], reverse=True)
+        return sorted(unique_deadlines, key=itemgetter('confidence'), reverse=True)
     
     def parse_single_message(self, message: str, sender: str = "Unknown") -> List[Dict]:
         """
@@ -76,15 +140,15 @@ class WhatsAppChatParser:
         Parse a single line from WhatsApp export
         Format: "MM/DD/YY, HH:MM - Contact Name: Message"
         """
-        # Common WhatsApp export patterns
-        patterns = [
-            r'(\d{1,2}/\d{1,2}/\d{2,4}),?\s+(\d{1,2}:\d{2})\s*(?:AM|PM)?\s*-\s*([^:]+):\s*(.+)',
-            r'(\d{1,2}/\d{1,2}/\d{2,4})\s+(\d{1,2}:\d{2})\s*-\s*([^:]+):\s*(.+)',
-            r'\[(\d{1,2}/\d{1,2}/\d{2,4}),?\s+(\d{1,2}:\d{2}:\d{2})\]\s*([^:]+):\s*(.+)'
-        ]
+        line = line.strip()
+        
+        # Every export format starts with a date or "[date"; skip continuation
+        # lines and system notices without running the patterns
+        if not line or line[0] not in '[0123456789':
+            return None
         
-        for pattern in patterns:
-            match = re.match(pattern, line.strip())
+        for pattern in self._line_patterns:
+            match = pattern.match(line)
             if match:
                 try:
                     date_str = match.group(1)
@@ -93,8 +157,7 @@ class WhatsAppChatParser:
                     message = match.group(4).strip()
                     
                     # Parse timestamp
-                    datetime_str = f"{date_str} {time_str}"
-                    timestamp = dateparser.parse(datetime_str)
+                    timestamp = self._parse_timestamp(date_str, time_str)
                     
                     if timestamp:
                         return {
@@ -107,6 +170,23 @@ class WhatsAppChatParser:
         
         return None
     
+    def _parse_timestamp(self, date_str: str, time_str: str) -> Optional[datetime]:
+        """Parse an export timestamp, falling back to dateparser for unknown formats"""
+        datetime_str = f"{date_str} {time_str}"
+        year_format = '%y' if len(date_str.rsplit('/', 1)[-1]) == 2 else '%Y'
+        time_format = '%H:%M:%S' if time_str.count(':') == 2 else '%H:%M'
+        
+        for i, date_order in enumerate(self._date_orders):
+            try:
+                timestamp = datetime.strptime(datetime_str, f"{date_order}{year_format} {time_format}")
+            except ValueError:
+                continue
+            if i:
+                self._date_orders.insert(0, self._date_orders.pop(i))
+            return timestamp
+        
+        return dateparser.parse(datetime_str)
+    
     def _extract_deadlines_from_message(self, message: str, sender: str, timestamp: datetime) -> List[Dict]:
         """
         Extract deadline information from a single message
@@ -119,14 +199,15 @@ class WhatsAppChatParser:
             return deadlines
         
         # Find deadline patterns
-        deadline_patterns = self._find_deadline_patterns(message, timestamp)
+        deadline_patterns = self._find_deadline_patterns(message, message_lower, timestamp)
+        priority = self._determine_priority(message_lower)
         
         for pattern in deadline_patterns:
             deadline = {
                 'title': pattern['task'],
                 'description': f"Extracted from WhatsApp: {message}",
                 'due_date': pattern['date'],
-                'priority': self._determine_priority(message_lower),
+                'priority': priority,
                 'source': 'whatsapp',
                 'original_message': message,
                 'sender': sender,
@@ -140,76 +221,65 @@ class WhatsAppChatParser:
     
     def _contains_deadline_indicators(self, message: str) -> bool:
         """Check if message contains deadline-related keywords"""
-        for keyword in self.deadline_keywords:
-            if keyword in message:
-                return True
-        
-        for time_expr in self.time_expressions:
-            if time_expr in message:
+        for term in self._indicator_terms:
+            if term in message:
                 return True
         
         return False
     
-    def _find_deadline_patterns(self, message: str, reference_date: datetime) -> List[Dict]:
+    def _find_deadline_patterns(self, message: str, message_lower: str, reference_date: datetime) -> List[Dict]:
         """Find and parse deadline patterns in message"""
         patterns = []
         
-        # Pattern 1: Direct deadline mentions
-        deadline_patterns = [
-            r'(.+?)\s+(?:is\s+)?due\s+(?:on\s+)?(.+?)(?:\.|$|,)',
-            r'(.+?)\s+deadline\s+(?:is\s+)?(.+?)(?:\.|$|,)',
-            r'submit\s+(.+?)\s+(?:by\s+|before\s+)(.+?)(?:\.|$|,)',
-            r'(.+?)\s+(?:assignment|homework|project)\s+(?:due\s+)?(.+?)(?:\.|$|,)',
-        ]
+        # Date text is sliced from the already lower-cased message; lower() only
+        # changes the length for rare characters (e.g. U+0130), where spans would shift
+        spans_align = len(message_lower) == len(message)
         
-        for pattern in deadline_patterns:
-            matches = re.finditer(pattern, message, re.IGNORECASE)
-            for match in matches:
-                task = match.group(1).strip()
-                date_text = match.group(2).strip()
-                
-                parsed_date = self._parse_date_expression(date_text, reference_date)
-                if parsed_date and len(task) > 2:
-                    patterns.append({
-                        'task': task,
-                        'date': parsed_date,
-                        'confidence': 0.9
-                    })
+        def lowered(match, group):
+            if spans_align:
+                return message_lower[match.start(group):match.end(group)].strip()
+            return match.group(group).lower().strip()
         
-        # Pattern 2: Event/meeting patterns
-        event_patterns = [
-            r'(.+?)\s+(?:meeting|presentation|exam|test|quiz)\s+(?:is\s+|on\s+)?(.+?)(?:\.|$|,)',
-            r'(.+?)\s+(?:tomorrow|today|tonight|next\s+week|this\s+week)',
-            r'(?:remember|don\'t forget),?\s+(.+?)\s+(?:is\s+)?(.+?)(?:\.|$|,)',
-        ]
+        # Pattern 1: Direct deadline mentions
+        for match in self._deadline_union.finditer(message):
+            # The date is the last group captured, so its name says which alternative hit
+            index = match.lastgroup[1:]
+            task = match.group('t' + index).strip()
+            date_text = lowered(match, 'd' + index)
+            
+            parsed_date = self._parse_date_expression(date_text, reference_date)
+            if parsed_date and len(task) > 2:
+                patterns.append({
+                    'task': task,
+                    'date': parsed_date,
+                    'confidence': 0.9
+                })
         
-        for pattern in event_patterns:
-            matches = re.finditer(pattern, message, re.IGNORECASE)
-            for match in matches:
-                if len(match.groups()) == 2:
-                    task = match.group(1).strip()
-                    date_text = match.group(2).strip()
-                    parsed_date = self._parse_date_expression(date_text, reference_date)
-                else:
-                    task = match.group(1).strip()
-                    # Extract relative time from task
-                    relative_words = ['tomorrow', 'today', 'tonight', 'next week', 'this week']
-                    date_text = next((word for word in relative_words if word in task.lower()), 'tomorrow')
-                    parsed_date = self._parse_date_expression(date_text, reference_date)
-                
-                if parsed_date and len(task) > 2:
-                    patterns.append({
-                        'task': task,
-                        'date': parsed_date,
-                        'confidence': 0.7
-                    })
+        # Pattern 2: Event/meeting patterns
+        for match in self._event_union.finditer(message):
+            index = match.lastgroup[1:]
+            task = match.group('t' + index).strip()
+            if match.lastgroup.startswith('d'):
+                date_text = lowered(match, match.lastgroup)
+                parsed_date = self._parse_date_expression(date_text, reference_date)
+            else:
+                # Extract relative time from task
+                relative_words = ['tomorrow', 'today', 'tonight', 'next week', 'this week']
+                task_lower = lowered(match, match.lastgroup)
+                date_text = next((word for word in relative_words if word in task_lower), 'tomorrow')
+                parsed_date = self._parse_date_expression(date_text, reference_date)
+            
+            if parsed_date and len(task) > 2:
+                patterns.append({
+                    'task': task,
+                    'date': parsed_date,
+                    'confidence': 0.7
+                })
         
         return patterns
     
     def _parse_date_expression(self, date_text: str, reference_date: datetime) -> Optional[datetime]:
-        """Parse various date expressions"""
-        date_text = date_text.lower().strip()
-        
+        """Parse various date expressions (date_text must be lower-cased and stripped)"""
         # Handle relative dates first
         if 'tomorrow' in date_text:
             return reference_date + timedelta(days=1)
@@ -225,36 +295,40 @@ class WhatsAppChatParser:
             return reference_date + relativedelta(months=1)
         
         # Handle day names
-        days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-        for i, day in enumerate(days):
-            if day in date_text:
-                days_ahead = (i - reference_date.weekday()) % 7
-                if days_ahead == 0:  # Same day, assume next week
-                    days_ahead = 7
-                target_date = reference_date + timedelta(days=days_ahead)
+        day_match = self._weekday_re.search(date_text)
+        if day_match:
+            days_ahead = (self._weekday_idx[day_match.group(1)] - reference_date.weekday()) % 7
+            if days_ahead == 0:  # Same day, assume next week
+                days_ahead = 7
+            target_date = reference_date + timedelta(days=days_ahead)
+            
+            # Extract time if present
+            time_match = self._time_re.search(date_text)
+            if time_match:
+                hour = int(time_match.group(1))
+                minute = int(time_match.group(2))
+                ampm = time_match.group(3)
                 
-                # Extract time if present
-                time_match = re.search(r'(\d{1,2}):(\d{2})\s*(am|pm)?', date_text)
-                if time_match:
-                    hour = int(time_match.group(1))
-                    minute = int(time_match.group(2))
-                    ampm = time_match.group(3)
-                    
-                    if ampm == 'pm' and hour != 12:
-                        hour += 12
-                    elif ampm == 'am' and hour == 12:
-                        hour = 0
-                    
-                    target_date = target_date.replace(hour=hour, minute=minute)
+                if ampm == 'pm' and hour != 12:
+                    hour += 12
+                elif ampm == 'am' and hour == 12:
+                    hour = 0
                 
-                return target_date
+                target_date = target_date.replace(hour=hour, minute=minute)
+            
+            return target_date
         
         # Try parsing with dateparser
         try:
-            parsed = dateparser.parse(date_text, settings={
-                'RELATIVE_BASE': reference_date,
-                'PREFER_DATES_FROM': 'future'
-            })
+            # Parse from midnight so one cached result serves the whole day
+            midnight = datetime.combine(reference_date.date(), datetime.min.time(), tzinfo=reference_date.tzinfo)
+            parsed = _dp(date_text, midnight)
+            if parsed and _OFFSET_RE.search(date_text):
+                # Offsets count from the reference time, not from midnight
+                parsed += reference_date - midnight
+            elif parsed and parsed <= reference_date:
+                # Times of day already past roll forward from the real reference time
+                parsed = _dp(date_text, reference_date)
             if parsed and parsed > reference_date:
                 return parsed
         except:
@@ -263,19 +337,17 @@ class WhatsAppChatParser:
         return None
     
     def _determine_priority(self, message: str) -> str:
-        """Determine priority based on message content"""
-        message_lower = message.lower()
-        
+        """Determine priority based on message content (already lower-cased)"""
         # Check for high priority indicators
-        if any(word in message_lower for word in self.priority_high):
+        if any(word in message for word in self.priority_high):
             return 'high'
         
         # Check for low priority indicators
-        if any(phrase in message_lower for phrase in self.priority_low):
+        if any(phrase in message for phrase in self.priority_low):
             return 'low'
         
         # Check for time urgency
-        if any(word in message_lower for word in ['tomorrow', 'today', 'tonight']):
+        if any(word in message for word in ['tomorrow', 'today', 'tonight']):
             return 'high'
         
         return 'medium'
@@ -283,36 +355,49 @@ class WhatsAppChatParser:
     def _remove_duplicates(self, deadlines: List[Dict]) -> List[Dict]:
         """Remove duplicate deadlines based on title and date similarity"""
         unique_deadlines = []
-        
-        for deadline in deadlines:
-            is_duplicate = False
+        unique_tokens = []
+        # With candidates in due-date order, duplicates (due within 24 hours)
+        # can only be among the unique deadlines still inside this window
+        window = deque()
+        
+        for deadline in sorted(deadlines, key=itemgetter('due_date')):
+            tokens = frozenset(deadline['title'].lower().split())
+            while window and (deadline['due_date'] - unique_deadlines[window[0]]['due_date']).total_seconds() >= 86400:
+                window.popleft()
             
-            for existing in unique_deadlines:
+            duplicate_of = None
+            for i in window:
+                existing = unique_deadlines[i]
                 # Check if titles are similar and dates are close
-                if (self._similar_strings(deadline['title'], existing['title']) and
+                if (self._similar_tokens(tokens, unique_tokens[i]) and
                     abs((deadline['due_date'] - existing['due_date']).total_seconds()) < 86400):  # Within 24 hours
-                    
-                    # Keep the one with higher confidence
-                    if deadline['confidence'] > existing['confidence']:
-                        unique_deadlines.remove(existing)
-                        unique_deadlines.append(deadline)
-                    is_duplicate = True
+                    duplicate_of = i
                     break
             
-            if not is_duplicate:
+            if duplicate_of is None:
+                window.append(len(unique_deadlines))
                 unique_deadlines.append(deadline)
+                unique_tokens.append(tokens)
+            elif deadline['confidence'] > unique_deadlines[duplicate_of]['confidence']:
+                # Keep the one with higher confidence; its due date only moves
+                # later, so it never leaves the window too early
+                unique_deadlines[duplicate_of] = deadline
+                unique_tokens[duplicate_of] = tokens
         
         return unique_deadlines
     
     def _similar_strings(self, str1: str, str2: str, threshold: float = 0.7) -> bool:
         """Check if two strings are similar using simple word overlap"""
-        words1 = set(str1.lower().split())
-        words2 = set(str2.lower().split())
-        
+        return self._similar_tokens(
+            frozenset(str1.lower().split()), frozenset(str2.lower().split()), threshold
+        )
+    
+    def _similar_tokens(self, words1: frozenset, words2: frozenset, threshold: float = 0.7) -> bool:
+        """Check if two pre-tokenized titles are similar using Jaccard word overlap"""
         if not words1 or not words2:
             return False
         
-        overlap = len(words1.intersection(words2))
-        similarity = overlap / max(len(words1), len(words2))
+        overlap = len(words1 & words2)
+        similarity = overlap / len(words1 | words2)
         
         return similarity >= threshold
\ No newline at end of file
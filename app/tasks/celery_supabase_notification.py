@@ -3,18 +3,29 @@ Celery Task: Supabase-based Deadline Reminders
 """
 import os
 import asyncio
+import functools
+import logging
+import weakref
+from collections import defaultdict
 from datetime import datetime, timedelta
+import httpx
+import redis
 from dotenv import load_dotenv
 from celery import shared_task
 from supabase import create_client, Client
 from app.config import settings
-from app.services.notification_service import get_notification_service, NotificationType
+from app.services.notification_service import get_notification_service, initialize_notification_service, NotificationType
 from app.services.email_service import send_email
+from app.tasks.event_loop import run_async
 
 # Load environment variables
 load_dotenv()
 
-# Create Supabase client lazily to avoid import-time errors
+logger = logging.getLogger(__name__)
+
+# Create Supabase client lazily to avoid import-time errors, then share it
+# (and its connection pool) across every task run in this worker process
+@functools.lru_cache(maxsize=1)
 def get_supabase_client():
     supabase_url = settings.SUPABASE_URL
     supabase_key = settings.SUPABASE_SERVICE_KEY
@@ -28,49 +39,221 @@ def get_supabase_client():
     )
 
 
+# Only the columns the email reminder task reads, to keep PostgREST payloads small
+EMAIL_DEADLINE_COLUMNS = 'id,user_id,title,description,due_date,priority'
+
+# Shared Redis client for cross-worker task locks
+@functools.lru_cache(maxsize=1)
+def _get_redis():
+    if settings.REDIS_URL.startswith('rediss://'):
+        # Same certificate handling as the Celery broker (Upstash)
+        return redis.Redis.from_url(settings.REDIS_URL, ssl_cert_reqs=None)
+    return redis.Redis.from_url(settings.REDIS_URL)
+
+# Held while an email reminder check runs, so overlapping beats or duplicate
+# schedulers skip instead of sending the same reminders twice; expires with
+# the task's hard time limit in case the worker dies holding it
+EMAIL_REMINDER_LOCK = 'lock:check_and_send_email_reminders'
+EMAIL_REMINDER_LOCK_TIMEOUT = 360
+
+# Offsets before the due date for each notification_reminders.reminder_time
+_REMINDER_TIMES = {
+    '15_min': timedelta(minutes=15),
+    '30_min': timedelta(minutes=30),
+    '1_hour': timedelta(hours=1),
+    '2_hours': timedelta(hours=2),
+    '1_day': timedelta(days=1),
+    '2_days': timedelta(days=2),
+    '1_week': timedelta(weeks=1),
+}
+_DEFAULT_REMINDER_TIME = timedelta(hours=1)
+
+def parse_reminder_time(reminder_str):
+    """Convert reminder time string (1_hour, 1_day, etc) to timedelta"""
+    return _REMINDER_TIMES.get(reminder_str, _DEFAULT_REMINDER_TIME)
+
+def _get_notification_service():
+    """Twilio service for this process; Celery workers don't run main.py, so initialize it on first use"""
+    service = get_notification_service()
+    if service is None:
+        try:
+            service = initialize_notification_service()
+        except ValueError as e:
+            logger.warning("Twilio notification service unavailable: %s", e)
+    return service
+
+def _notification_type(phone):
+    """WhatsApp for 'whatsapp:' numbers, SMS otherwise"""
+    return NotificationType.WHATSAPP if phone.startswith('whatsapp:') else NotificationType.SMS
+
+# Phone reminders in flight at once per beat, within Twilio's rate limits
+REMINDER_SEND_CONCURRENCY = 10
+
+# Max ids per PostgREST in.() filter, keeping request URLs well under proxy limits
+IN_FILTER_CHUNK = 200
+
+def _chunked(ids, size=IN_FILTER_CHUNK):
+    """Split ids into lists small enough for one in.() filter"""
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+# Async PostgREST clients, one per event loop
+_REST_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def _get_rest_client() -> httpx.AsyncClient:
+    """Get the keep-alive PostgREST client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _REST_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        supabase_url = settings.SUPABASE_URL
+        supabase_key = settings.SUPABASE_SERVICE_KEY
+        
+        if not supabase_url or not supabase_key:
+            raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set in config")
+        
+        client = httpx.AsyncClient(
+            base_url=f"{supabase_url}/rest/v1",
+            headers={"apikey": supabase_key, "Authorization": f"Bearer {supabase_key}"},
+            http2=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            timeout=30.0
+        )
+        _REST_CLIENTS[loop] = client
+    return client
 
-@shared_task(name="send_supabase_deadline_reminders")
+# Rows per PostgREST request; Supabase caps responses at 1000 rows by default
+PAGE_SIZE = 1000
+
+async def _iter_pages(method, path, page_size=PAGE_SIZE, **kwargs):
+    """Yield a PostgREST result one Range page at a time"""
+    client = _get_rest_client()
+    offset = 0
+    while True:
+        response = await client.request(method, path, headers={
+            'Range-Unit': 'items', 'Range': f"{offset}-{offset + page_size - 1}"
+        }, **kwargs)
+        response.raise_for_status()
+        rows = response.json()
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        offset += page_size
+
+async def _fetch(table, params):
+    """GET all rows from a PostgREST table, page by page; params is a list of (column, filter) pairs"""
+    rows = []
+    # Pages are only consistent under a total order
+    params = [*params, ('order', 'id')]
+    async for page in _iter_pages('GET', f"/{table}", params=params):
+        rows.extend(page)
+    return rows
+
+async def _count(table, params):
+    """Exact row count for a PostgREST filter, read from Content-Range without fetching rows"""
+    response = await _get_rest_client().head(f"/{table}", params=params, headers={'Prefer': 'count=exact'})
+    response.raise_for_status()
+    return int(response.headers['content-range'].rpartition('/')[2])
+
+async def _insert_new(table, rows, on_conflict):
+    """INSERT rows, skipping conflicts on on_conflict; returns only the rows actually inserted"""
+    response = await _get_rest_client().post(
+        f"/{table}",
+        params={'on_conflict': on_conflict},
+        json=rows,
+        headers={'Prefer': 'resolution=ignore-duplicates,return=representation'}
+    )
+    response.raise_for_status()
+    return response.json()
+
+async def _release_claims(pairs):
+    """Delete sent_reminders claims whose send failed, so a later run retries them"""
+    results = await asyncio.gather(*[
+        _get_rest_client().delete('/sent_reminders', params=[
+            ('deadline_id', f'eq.{deadline_id}'), ('reminder_time', f'eq.{reminder_time}')
+        ])
+        for deadline_id, reminder_time in pairs
+    ], return_exceptions=True)
+    for (deadline_id, reminder_time), result in zip(pairs, results):
+        if isinstance(result, BaseException):
+            error = result
+        elif result.is_error:
+            error = f"HTTP {result.status_code}"
+        else:
+            continue
+        logger.error("Failed to release reminder claim (%s, %s): %s", deadline_id, reminder_time, error)
+
+def _parse_iso(value):
+    """Parse a PostgREST timestamp; a trailing 'Z' (which Python 3.10's fromisoformat rejects) is only rewritten when present"""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def _in(ids):
+    """PostgREST in.() filter value"""
+    return f"in.({','.join(map(str, ids))})"
+
+
+# Reminder batches dedupe through sent_reminders, so they are safe to
+# redeliver when the worker running them is killed
+@shared_task(name="send_supabase_deadline_reminders", acks_late=True, reject_on_worker_lost=True)
 def send_supabase_deadline_reminders():
     """
     Celery task to send reminders for upcoming/overdue deadlines using Supabase.
     """
-    supabase = get_supabase_client()
-    now = datetime.utcnow()
-    soon = now + timedelta(hours=1)
-    overdue = now
-    # Get all active users
-    users_result = supabase.table('users').select('id', 'phone', 'is_active').eq('is_active', True).execute()
-    users = users_result.data or []
-    notification_service = get_notification_service()
-    for user in users:
-        user_id = user['id']
-        phone = user.get('phone')
-        if not phone:
-            continue
-        # Upcoming deadlines (due in next hour)
-        deadlines_result = supabase.table('deadlines').select('*').eq('user_id', user_id).eq('status', 'pending').gte('deadline_date', now.isoformat()).lte('deadline_date', soon.isoformat()).execute()
-        deadlines = deadlines_result.data or []
-        for d in deadlines:
-            notification_service.send_deadline_reminder(
-                phone_number=phone,
-                deadline_title=d['title'],
-                deadline_date=datetime.fromisoformat(d['deadline_date']),
-                deadline_url=d.get('portal_url'),
-                notification_type=NotificationType.WHATSAPP if phone.startswith('whatsapp:') else NotificationType.SMS,
-                priority=d.get('priority', 'medium')
-            )
-        # Overdue deadlines
-        overdue_result = supabase.table('deadlines').select('*').eq('user_id', user_id).eq('status', 'overdue').lte('deadline_date', overdue.isoformat()).execute()
-        overdue_deadlines = overdue_result.data or []
-        for d in overdue_deadlines:
-            notification_service.send_deadline_reminder(
-                phone_number=phone,
+    return run_async(_send_supabase_deadline_reminders())
+
+
+async def _send_supabase_deadline_reminders():
+    notification_service = _get_notification_service()
+    if notification_service is None:
+        logger.warning("Skipping phone deadline reminders: Twilio is not configured")
+        return {"success": True, "skipped": True, "message": "Notification service not configured"}
+    
+    semaphore = asyncio.Semaphore(REMINDER_SEND_CONCURRENCY)
+    # Channel per user, decided once however many deadlines they have due
+    notification_types = {}
+    
+    async def _send(d, notification_type):
+        async with semaphore:
+            return await notification_service.send_deadline_reminder(
+                phone_number=d['phone'],
                 deadline_title=d['title'],
-                deadline_date=datetime.fromisoformat(d['deadline_date']),
+                deadline_date=_parse_iso(d['due_date']),
                 deadline_url=d.get('portal_url'),
-                notification_type=NotificationType.WHATSAPP if phone.startswith('whatsapp:') else NotificationType.SMS,
+                notification_type=notification_type,
                 priority=d.get('priority', 'medium')
             )
+    
+    # Active users with a phone joined to their upcoming (due within the
+    # hour) and overdue deadlines, dispatched a page at a time as they arrive
+    async for rows in _iter_pages('POST', '/rpc/due_reminders', params={'order': 'kind,deadline_id'}, json={'horizon_minutes': 60}):
+        # The beat runs every 15 minutes but each deadline should be texted
+        # once per kind, so claim the rows in sent_reminders and only send
+        # the ones this run inserted
+        claimed = await _insert_new('sent_reminders', [
+            {'deadline_id': d['deadline_id'], 'reminder_time': f"phone_{d['kind']}"} for d in rows
+        ], on_conflict='deadline_id,reminder_time')
+        claimed = {(r['deadline_id'], r['reminder_time']) for r in claimed}
+        rows = [d for d in rows if (d['deadline_id'], f"phone_{d['kind']}") in claimed]
+        
+        for d in rows:
+            if d['user_id'] not in notification_types:
+                notification_types[d['user_id']] = _notification_type(d['phone'])
+        results = await asyncio.gather(
+            *[_send(d, notification_types[d['user_id']]) for d in rows],
+            return_exceptions=True
+        )
+        failed = []
+        for d, result in zip(rows, results):
+            if isinstance(result, BaseException) or not result.get('success'):
+                error = result if isinstance(result, BaseException) else result.get('error')
+                logger.error("Failed to send reminder for '%s' to %s: %s", d['title'], d['phone'], error)
+                failed.append((d['deadline_id'], f"phone_{d['kind']}"))
+        if failed:
+            await _release_claims(failed)
     return {"success": True, "message": "Reminders sent."}
 
 
@@ -82,10 +265,12 @@ def send_deadline_reminder(deadline_id: int):
     Send a reminder for a specific deadline.
     """
     supabase = get_supabase_client()
-    notification_service = get_notification_service()
+    notification_service = _get_notification_service()
+    if notification_service is None:
+        return {"success": False, "error": "Notification service not available"}
     
     # Get deadline details
-    deadline_result = supabase.table('deadlines').select('*').eq('id', deadline_id).execute()
+    deadline_result = supabase.table('deadlines').select('user_id,title,due_date,portal_url,priority').eq('id', deadline_id).execute()
     if not deadline_result.data:
         return {"success": False, "error": "Deadline not found"}
     
@@ -104,84 +289,152 @@ def send_deadline_reminder(deadline_id: int):
     
     # Send the reminder
     try:
-        notification_service.send_deadline_reminder(
+        result = run_async(notification_service.send_deadline_reminder(
             phone_number=phone,
             deadline_title=deadline['title'],
-            deadline_date=datetime.fromisoformat(deadline['due_date'].replace('Z', '+00:00')),
+            deadline_date=_parse_iso(deadline['due_date']),
             deadline_url=deadline.get('portal_url'),
-            notification_type=NotificationType.WHATSAPP if phone.startswith('whatsapp:') else NotificationType.SMS,
+            notification_type=_notification_type(phone),
             priority=deadline.get('priority', 'medium')
-        )
+        ))
+        if not result.get('success'):
+            return {"success": False, "error": result.get('error')}
         return {"success": True, "message": f"Reminder sent for deadline {deadline_id}"}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
-@shared_task(name="check_and_send_email_reminders")
+@shared_task(
+    name="check_and_send_email_reminders",
+    soft_time_limit=300,
+    time_limit=EMAIL_REMINDER_LOCK_TIMEOUT,
+    acks_late=True,
+    reject_on_worker_lost=True
+)
 def check_and_send_email_reminders():
     """
     Check for deadlines and send email reminders based on notification_settings and notification_reminders.
     This task runs periodically to send reminders at the configured times before deadlines.
     Supports relative times like: 1_hour, 1_day, 1_week before deadline.
     """
-    supabase = get_supabase_client()
+    lock = _get_redis().lock(EMAIL_REMINDER_LOCK, timeout=EMAIL_REMINDER_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        logger.info("[EMAIL REMINDERS] Another run is still in progress, skipping")
+        return {"success": True, "skipped": True, "message": "Another reminder check is running"}
+    try:
+        return run_async(_check_and_send_email_reminders())
+    finally:
+        try:
+            lock.release()
+        except redis.exceptions.LockError:
+            # Expired (and possibly taken by a later run) before we finished
+            logger.warning("[EMAIL REMINDERS] Lock expired before the run finished")
+
+
+async def _send_reminder_email(email, deadline_title, subject, body):
+    """Send one reminder email, logging the outcome; returns whether it was sent"""
+    try:
+        await send_email(
+            to_email=email,
+            subject=subject,
+            body=body
+        )
+        logger.info("[EMAIL REMINDERS] ✓ Email sent to %s for deadline: %s", email, deadline_title)
+        return True
+    except Exception as email_error:
+        logger.error("[EMAIL REMINDERS] ✗ Failed to send email to %s: %s", email, email_error)
+        return False
+
+
+async def _check_and_send_email_reminders():
     now = datetime.utcnow().replace(tzinfo=None)  # Make timezone-naive for comparison
     
-    print(f"[EMAIL REMINDERS] Running at {now.isoformat()}")
+    logger.info("[EMAIL REMINDERS] Running at %s", now.isoformat())
     
-    # Parse reminder time to timedelta
-    def parse_reminder_time(reminder_str):
-        """Convert reminder time string (1_hour, 1_day, etc) to timedelta"""
-        time_map = {
-            '15_min': timedelta(minutes=15),
-            '30_min': timedelta(minutes=30),
-            '1_hour': timedelta(hours=1),
-            '2_hours': timedelta(hours=2),
-            '1_day': timedelta(days=1),
-            '2_days': timedelta(days=2),
-            '1_week': timedelta(weeks=1),
-        }
-        return time_map.get(reminder_str, timedelta(hours=1))
+    window = timedelta(minutes=5)
     
     try:
+        # Most beats have nothing due in any reminder window; check that with
+        # a head-only count before loading users, reminders and deadlines
+        due_soon = await _count('deadlines', [
+            ('status', 'eq.pending'),
+            ('due_date', f'gte.{(now + min(_REMINDER_TIMES.values()) - window).isoformat()}'),
+            ('due_date', f'lte.{(now + max(_REMINDER_TIMES.values()) + window).isoformat()}')
+        ])
+        if not due_soon:
+            logger.info("[EMAIL REMINDERS] No pending deadlines in any reminder window, skipping")
+            return {"success": True, "skipped": True, "message": f"Checked reminders at {now.isoformat()}"}
+        
         # Get all users with email notifications enabled
-        settings_result = supabase.table('notification_settings').select('*').eq('email_enabled', True).execute()
-        all_settings = settings_result.data or []
+        all_settings = await _fetch('notification_settings', [('select', 'user_id,email'), ('email_enabled', 'eq.true')])
+        
+        logger.info("[EMAIL REMINDERS] Found %s users with email enabled", len(all_settings))
+        
+        # Fetch reminder times for all of these users in bulk, then join them
+        # per user in memory
+        results = await asyncio.gather(*[_fetch('notification_reminders', [
+            ('select', 'user_id,reminder_time'), ('user_id', _in(chunk)), ('email_enabled', 'eq.true')
+        ]) for chunk in _chunked([s['user_id'] for s in all_settings if s.get('email')])])
+        # (offset, reminder_time) pairs per user, parsed once up front
+        reminders_by_user = defaultdict(list)
+        # Users to check for each distinct reminder offset
+        users_by_delta = defaultdict(set)
+        for rows in results:
+            for r in rows:
+                reminder_time_str = r.get('reminder_time')
+                if not reminder_time_str:
+                    continue
+                reminder_delta = parse_reminder_time(reminder_time_str)
+                reminders_by_user[r['user_id']].append((reminder_delta, reminder_time_str))
+                users_by_delta[reminder_delta].add(r['user_id'])
+        
+        # Only pending deadlines falling within 5 minutes of one of their
+        # owner's reminder offsets can match, so let PostgREST filter on that
+        # window instead of downloading every pending deadline
+        results = await asyncio.gather(*[_fetch('deadlines', [
+            ('select', EMAIL_DEADLINE_COLUMNS), ('user_id', _in(chunk)), ('status', 'eq.pending'),
+            ('due_date', f'gte.{(now + delta - window).isoformat()}'),
+            ('due_date', f'lte.{(now + delta + window).isoformat()}')
+        ]) for delta, user_ids in users_by_delta.items() for chunk in _chunked(list(user_ids))])
+        deadlines_by_user = defaultdict(dict)
+        for rows in results:
+            for d in rows:
+                # Windows may overlap; keep each deadline once
+                deadlines_by_user[d['user_id']][d['id']] = d
         
-        print(f"[EMAIL REMINDERS] Found {len(all_settings)} users with email enabled")
+        # Reminder emails are queued here and sent concurrently at the end
+        to_send = []
         
         for settings in all_settings:
             user_id = settings['user_id']
             email = settings.get('email')
             
             if not email:
-                print(f"[EMAIL REMINDERS] User {user_id} has no email configured, skipping")
+                logger.debug("[EMAIL REMINDERS] User %s has no email configured, skipping", user_id)
                 continue
             
-            # Get reminder times for this user
-            reminders_result = supabase.table('notification_reminders').select('*').eq('user_id', user_id).eq('email_enabled', True).execute()
-            reminders = reminders_result.data or []
+            # Reminder times for this user
+            reminders = reminders_by_user.get(user_id, [])
             
             if not reminders:
-                print(f"[EMAIL REMINDERS] User {user_id} has no email reminder times configured")
+                logger.debug("[EMAIL REMINDERS] User %s has no email reminder times configured", user_id)
                 continue
             
-            print(f"[EMAIL REMINDERS] Checking deadlines for user {user_id} ({email})")
+            logger.debug("[EMAIL REMINDERS] Checking deadlines for user %s (%s)", user_id, email)
             
-            # Get all pending deadlines for this user
-            deadlines_result = supabase.table('deadlines').select('*').eq('user_id', user_id).eq('status', 'pending').gte('due_date', now.isoformat()).execute()
-            deadlines = deadlines_result.data or []
+            # Pending deadlines for this user that fall in a reminder window
+            deadlines = list(deadlines_by_user.get(user_id, {}).values())
             
             if not deadlines:
-                print(f"[EMAIL REMINDERS] No pending deadlines for {email}")
+                logger.debug("[EMAIL REMINDERS] No pending deadlines in a reminder window for %s", email)
                 continue
             
-            print(f"[EMAIL REMINDERS] Found {len(deadlines)} pending deadlines for {email}")
+            logger.debug("[EMAIL REMINDERS] Found %s pending deadlines in a reminder window for %s", len(deadlines), email)
             
             # Check each deadline against reminder times
             for deadline in deadlines:
                 try:
-                    deadline_date = datetime.fromisoformat(deadline['due_date'].replace('Z', '+00:00'))
+                    deadline_date = _parse_iso(deadline['due_date'])
                     # Make timezone-naive for comparison
                     if deadline_date.tzinfo:
                         deadline_date = deadline_date.replace(tzinfo=None)
@@ -189,22 +442,13 @@ def check_and_send_email_reminders():
                     time_until_deadline = deadline_date - now
                     
                     # Check if we should send reminder for any configured time
-                    for reminder in reminders:
-                        reminder_time_str = reminder.get('reminder_time')
-                        if not reminder_time_str:
-                            continue
-                        
-                        reminder_delta = parse_reminder_time(reminder_time_str)
-                        
+                    for reminder_delta, reminder_time_str in reminders:
                         # Check if we're within 5 minutes of the reminder time
                         # e.g., if deadline is in 1 day and reminder is "1_day", send now
                         time_diff = abs(time_until_deadline - reminder_delta)
                         
-                        if time_diff < timedelta(minutes=5):
-                            print(f"[EMAIL REMINDERS] Sending email for '{deadline['title']}' ({reminder_time_str} reminder)")
-                            
-                            # Check if we already sent this reminder (to avoid duplicates)
-                            # You can add a "last_reminder_sent" check here if needed
+                        if time_diff < window:
+                            logger.info("[EMAIL REMINDERS] Sending email for '%s' (%s reminder)", deadline['title'], reminder_time_str)
                             
                             # Prepare email content
                             subject = f"Reminder: {deadline['title']} deadline approaching"
@@ -226,33 +470,40 @@ Best regards,
 Your Deadline Reminder System
 """
                             
-                            # Run async email send in sync context
-                            loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(loop)
-                            
-                            try:
-                                loop.run_until_complete(
-                                    send_email(
-                                        to_email=email,
-                                        subject=subject,
-                                        body=body
-                                    )
-                                )
-                                print(f"[EMAIL REMINDERS] ✓ Email sent to {email} for deadline: {deadline['title']}")
-                            except Exception as email_error:
-                                print(f"[EMAIL REMINDERS] ✗ Failed to send email to {email}: {email_error}")
-                            finally:
-                                loop.close()
+                            to_send.append((deadline['id'], reminder_time_str, email, deadline['title'], subject, body))
                             
                             break  # Only send once per deadline per check
                             
                 except Exception as e:
-                    print(f"[EMAIL REMINDERS] Error processing deadline {deadline.get('id')}: {e}")
+                    logger.error("[EMAIL REMINDERS] Error processing deadline %s: %s", deadline.get('id'), e)
+        
+        if to_send:
+            # Windows overlap across beats, so claim each (deadline, reminder)
+            # pair in sent_reminders first and only email the pairs this run
+            # actually inserted
+            claimed = await _insert_new('sent_reminders', [
+                {'deadline_id': deadline_id, 'reminder_time': reminder_time_str}
+                for deadline_id, reminder_time_str, *_ in to_send
+            ], on_conflict='deadline_id,reminder_time')
+            claimed = {(r['deadline_id'], r['reminder_time']) for r in claimed}
+            skipped = len(to_send) - len(claimed)
+            if skipped:
+                logger.info("[EMAIL REMINDERS] Skipping %s reminders already sent", skipped)
+            
+            claimed_sends = [item for item in to_send if (item[0], item[1]) in claimed]
+            sent = await asyncio.gather(*[
+                _send_reminder_email(email, title, subject, body)
+                for deadline_id, reminder_time_str, email, title, subject, body in claimed_sends
+            ], return_exceptions=True)
+            
+            # Give failed sends their claim back so the next beat retries them
+            # while the deadline is still inside the window
+            failed = [(item[0], item[1]) for item, ok in zip(claimed_sends, sent) if ok is not True]
+            if failed:
+                await _release_claims(failed)
         
         return {"success": True, "message": f"Checked reminders at {now.isoformat()}"}
         
     except Exception as e:
-        print(f"[EMAIL REMINDERS] Error in check_and_send_email_reminders: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[EMAIL REMINDERS] Error in check_and_send_email_reminders: %s", e)
         return {"success": False, "error": str(e)}
@@ -0,0 +1,21 @@
+"""
+Event Loop Helper
+
+Runs coroutines from synchronous Celery tasks on a long-lived event loop.
+"""
+
+import asyncio
+import threading
+
+# One event loop per worker thread, kept across task runs so the pooled
+# PostgREST, SendGrid and Twilio connections stay warm between tasks
+_thread_state = threading.local()
+
+
+def run_async(coro):
+    """Run a coroutine to completion on this thread's long-lived event loop"""
+    loop = getattr(_thread_state, 'loop', None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_state.loop = loop
+    return loop.run_until_complete(coro)
@@ -4,22 +4,22 @@ Notification Tasks
 Background tasks for automated deadline notifications and reminders.
 """
 
-import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from celery import shared_task
 
-from app.supabase_client import SupabaseConfig
+from app.supabase_client import get_supabase, get_supabase_admin
 from app.services.notification_service import get_notification_service, NotificationType
+from app.tasks.event_loop import run_async
 
 logger = logging.getLogger(__name__)
 
 
 def get_supabase_client():
     """Get Supabase client for tasks"""
-    config = SupabaseConfig()
-    return config.get_service_client() or config.get_client()
+    # Reuse the process-wide clients instead of building new ones per task
+    return get_supabase_admin() or get_supabase()
 
 
 @shared_task(bind=True, name='app.tasks.notification_tasks.send_deadline_reminder')
@@ -79,11 +79,8 @@ def send_deadline_reminder(self, deadline_id: int, notification_type: str = 'sms
 
         # Send notification
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
             notif_type = NotificationType.WHATSAPP if preferences.get('preferred_method') == 'whatsapp' else NotificationType.SMS
-            result = loop.run_until_complete(
+            result = run_async(
                 notification_service.send_deadline_reminder(
                     phone_number=phone_number,
                     deadline_title=deadline['title'],
@@ -93,8 +90,6 @@ def send_deadline_reminder(self, deadline_id: int, notification_type: str = 'sms
                     priority=deadline.get('priority', 'medium')
                 )
             )
-
-            loop.close()
             
         except Exception as e:
             logger.error(f"Failed to send deadline reminder: {e}")
@@ -328,11 +323,8 @@ def send_daily_summaries(self):
                 
                 # Send summary
                 try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    
                     notif_type = NotificationType.WHATSAPP if preferences.preferred_method == 'whatsapp' else NotificationType.SMS
-                    result = loop.run_until_complete(
+                    result = run_async(
                         notification_service.send_daily_summary(
                             phone_number=preferences.phone_number,
                             deadlines=deadline_dicts,
@@ -340,8 +332,6 @@ def send_daily_summaries(self):
                         )
                     )
                     
-                    loop.close()
-                    
                 except Exception as e:
                     logger.error(f"Failed to send daily summary to user {user.id}: {e}")
                     result = {"success": False, "error": str(e)}
@@ -483,11 +473,8 @@ def check_overdue_deadlines(self):
                 
                 # Send overdue alert
                 try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    
                     notif_type = NotificationType.WHATSAPP if preferences.preferred_method == 'whatsapp' else NotificationType.SMS
-                    result = loop.run_until_complete(
+                    result = run_async(
                         notification_service.send_overdue_alert(
                             phone_number=preferences.phone_number,
                             overdue_deadlines=overdue_data,
@@ -495,8 +482,6 @@ def check_overdue_deadlines(self):
                         )
                     )
                     
-                    loop.close()
-                    
                 except Exception as e:
                     logger.error(f"Failed to send overdue alert to user {user_id}: {e}")
                     result = {"success": False, "error": str(e)}
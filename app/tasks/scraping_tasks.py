@@ -10,17 +10,18 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any
 from celery import shared_task
 
-from app.supabase_client import SupabaseConfig
+from app.supabase_client import get_supabase, get_supabase_admin
 from app.scrapers.scraper_registry import ScraperRegistry
 from app.scrapers.base_scraper import ScrapedDeadline
+from app.scrapers.utils import close_shared_connector
 
 logger = logging.getLogger(__name__)
 
 
 def get_supabase_client():
     """Get Supabase client for tasks"""
-    config = SupabaseConfig()
-    return config.get_service_client() or config.get_client()
+    # Reuse the process-wide clients instead of building new ones per task
+    return get_supabase_admin() or get_supabase()
 
 
 @shared_task(bind=True, name='app.tasks.scraping_tasks.scrape_portal')
@@ -65,9 +66,12 @@ def scrape_portal(self, portal_id: int):
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
 
-            result = loop.run_until_complete(scraper.scrape())
-
-            loop.close()
+            try:
+                result = loop.run_until_complete(scraper.scrape())
+            finally:
+                # The shared connector belongs to this loop, so close it here
+                loop.run_until_complete(close_shared_connector())
+                loop.close()
 
             if result.status.value == "success":
                 scraped_deadlines = result.deadlines
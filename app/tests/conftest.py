@@ -0,0 +1,7 @@
+import os
+
+# app.database builds its Supabase clients at import time, so give it
+# placeholder credentials when no .env is present
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test.anon.key")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test.service.key")
@@ -0,0 +1,215 @@
+import asyncio
+from datetime import datetime, timezone
+import time
+
+import jwt
+import pytest
+
+from app.services import auth_service as auth_module
+from app.services.auth_service import auth_service
+
+JWT_SECRET = "test-jwt-secret"
+
+@pytest.fixture(autouse=True)
+def clean_caches(monkeypatch):
+    monkeypatch.setattr(auth_service, "_jwt_secret", JWT_SECRET)
+    auth_module._USER_CACHE.clear()
+    auth_module._REVOKED_TOKENS.clear()
+    auth_module._INFLIGHT_REFRESHES.clear()
+    yield
+    auth_module._USER_CACHE.clear()
+    auth_module._REVOKED_TOKENS.clear()
+
+def _token(exp_in=3600, **claims):
+    payload = {
+        "sub": "user-1",
+        "email": "user@example.com",
+        "aud": "authenticated",
+        "exp": int(time.time()) + exp_in,
+        "user_metadata": {"full_name": "Test User"},
+        **claims
+    }
+    return jwt.encode(payload, JWT_SECRET, algorithm="HS256")
+
+# User cache
+
+def test_get_user_from_token_verifies_locally():
+    user = asyncio.run(auth_service.get_user_from_token(_token()))
+    assert user["id"] == "user-1"
+    assert user["email"] == "user@example.com"
+    assert user["full_name"] == "Test User"
+    assert len(auth_module._USER_CACHE) == 1
+
+def test_local_user_fields_from_claims():
+    iat = int(time.time()) - 60
+    token = _token(iat=iat, user_metadata={"full_name": "Test User", "email_verified": True})
+    user = asyncio.run(auth_service.get_user_from_token(token))
+
+    assert user["email_confirmed"] is True
+    assert user["last_sign_in"] == datetime.fromtimestamp(iat, tz=timezone.utc)
+    # The claims carry no account creation time
+    assert user["created_at"] is None
+
+def test_local_user_unverified_email_is_not_confirmed():
+    user = asyncio.run(auth_service.get_user_from_token(_token()))
+    assert user["email_confirmed"] is False
+    assert user["last_sign_in"] is None
+
+def test_cached_user_skips_verification(monkeypatch):
+    token = _token()
+    first = asyncio.run(auth_service.get_user_from_token(token))
+
+    def fail_decode(*args, **kwargs):
+        raise AssertionError("cache hit should not decode the token")
+
+    monkeypatch.setattr(auth_module.jwt, "decode", fail_decode)
+    assert asyncio.run(auth_service.get_user_from_token(token)) == first
+
+def test_cached_user_is_not_shared_between_callers():
+    token = _token()
+    first = asyncio.run(auth_service.get_user_from_token(token))
+    first["email"] = "changed@example.com"
+    first["user_metadata"]["full_name"] = "Changed"
+
+    second = asyncio.run(auth_service.get_user_from_token(token))
+    assert second is not first
+    assert second["email"] == "user@example.com"
+    assert second["user_metadata"] == {"full_name": "Test User"}
+
+def test_expired_cache_entry_is_dropped():
+    token = _token()
+    key = auth_module._token_key(token)
+    user = asyncio.run(auth_service.get_user_from_token(token))
+    auth_module._USER_CACHE[key] = (time.time() - 1, user)
+
+    assert asyncio.run(auth_service.get_user_from_token(token)) == user
+    exp, _ = auth_module._USER_CACHE[key]
+    assert exp > time.time()
+
+def test_expired_token_is_rejected():
+    assert asyncio.run(auth_service.get_user_from_token(_token(exp_in=-60))) is None
+    assert len(auth_module._USER_CACHE) == 0
+
+@pytest.mark.parametrize("claim", ["sub", "exp"])
+def test_token_missing_claim_falls_back_to_supabase(monkeypatch, claim):
+    payload = jwt.decode(_token(), JWT_SECRET, algorithms=["HS256"], audience="authenticated")
+    del payload[claim]
+    token = jwt.encode(payload, JWT_SECRET, algorithm="HS256")
+    checked = []
+
+    def get_user(jwt):
+        checked.append(jwt)
+        raise RuntimeError("invalid token")
+
+    monkeypatch.setattr(auth_service.supabase.auth, "get_user", get_user)
+
+    assert asyncio.run(auth_service.get_user_from_token(token)) is None
+    assert checked == [token]
+
+def test_sign_out_revokes_cached_token(monkeypatch):
+    token = _token()
+    revoked = []
+    monkeypatch.setattr(auth_service.supabase_admin.auth.admin, "sign_out", revoked.append)
+    assert asyncio.run(auth_service.get_user_from_token(token)) is not None
+
+    result = asyncio.run(auth_service.sign_out(token))
+
+    assert result == {"message": "Successfully signed out"}
+    assert revoked == [token]
+    assert len(auth_module._USER_CACHE) == 0
+    assert asyncio.run(auth_service.get_user_from_token(token)) is None
+
+def test_sign_out_revokes_token_when_supabase_fails(monkeypatch):
+    token = _token()
+
+    def fail_sign_out(jwt):
+        raise RuntimeError("network down")
+
+    monkeypatch.setattr(auth_service.supabase_admin.auth.admin, "sign_out", fail_sign_out)
+
+    assert asyncio.run(auth_service.sign_out(token)) == {"message": "Sign out completed"}
+    assert asyncio.run(auth_service.get_user_from_token(token)) is None
+
+# Single-flight token refresh
+
+def test_concurrent_refreshes_share_one_call(monkeypatch):
+    calls = []
+
+    async def refresh_session(refresh_token):
+        calls.append(refresh_token)
+        await asyncio.sleep(0.01)
+        return "new-access-token"
+
+    monkeypatch.setattr(auth_service, "_refresh_session", refresh_session)
+
+    async def refresh_many():
+        return await asyncio.gather(*(auth_service.refresh_token("refresh-1") for _ in range(5)))
+
+    assert asyncio.run(refresh_many()) == ["new-access-token"] * 5
+    assert calls == ["refresh-1"]
+    assert auth_module._INFLIGHT_REFRESHES == {}
+
+def test_refreshes_of_different_tokens_are_not_coalesced(monkeypatch):
+    calls = []
+
+    async def refresh_session(refresh_token):
+        calls.append(refresh_token)
+        await asyncio.sleep(0.01)
+        return f"access-for-{refresh_token}"
+
+    monkeypatch.setattr(auth_service, "_refresh_session", refresh_session)
+
+    async def refresh_both():
+        return await asyncio.gather(auth_service.refresh_token("a"), auth_service.refresh_token("b"))
+
+    assert asyncio.run(refresh_both()) == ["access-for-a", "access-for-b"]
+    assert sorted(calls) == ["a", "b"]
+
+def test_sequential_refreshes_each_call_supabase(monkeypatch):
+    calls = []
+
+    async def refresh_session(refresh_token):
+        calls.append(refresh_token)
+        return "new-access-token"
+
+    monkeypatch.setattr(auth_service, "_refresh_session", refresh_session)
+
+    asyncio.run(auth_service.refresh_token("refresh-1"))
+    asyncio.run(auth_service.refresh_token("refresh-1"))
+    assert calls == ["refresh-1", "refresh-1"]
+
+def test_waiters_get_the_leaders_error(monkeypatch):
+    calls = []
+
+    async def refresh_session(refresh_token):
+        calls.append(refresh_token)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("refresh failed")
+
+    monkeypatch.setattr(auth_service, "_refresh_session", refresh_session)
+
+    async def refresh_many():
+        return await asyncio.gather(
+            *(auth_service.refresh_token("refresh-1") for _ in range(3)),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(refresh_many())
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert auth_module._INFLIGHT_REFRESHES == {}
+
+def test_refresh_error_is_retried_by_next_caller(monkeypatch):
+    outcomes = [RuntimeError("refresh failed"), "new-access-token"]
+
+    async def refresh_session(refresh_token):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(auth_service, "_refresh_session", refresh_session)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(auth_service.refresh_token("refresh-1"))
+    assert asyncio.run(auth_service.refresh_token("refresh-1")) == "new-access-token"
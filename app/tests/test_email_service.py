@@ -0,0 +1,74 @@
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+from app.services import email_service
+
+@pytest.fixture
+def sendgrid(monkeypatch):
+    """Route SendGrid calls to a mock transport and collect the payloads"""
+    requests = []
+    responses = []
+
+    def handler(request):
+        requests.append(orjson.loads(request.content))
+        return responses.pop(0) if responses else httpx.Response(202)
+
+    monkeypatch.setattr(email_service, "_SENDGRID_KEY", "test-key")
+    monkeypatch.setattr(
+        email_service,
+        "_get_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    return requests, responses
+
+def _recipients(payload):
+    return [p["to"][0]["email"] for p in payload["personalizations"]]
+
+def test_send_email_single_address(sendgrid):
+    requests, _ = sendgrid
+    assert asyncio.run(email_service.send_email("a@example.com", "Subject", "Body")) is True
+
+    assert len(requests) == 1
+    assert requests[0]["personalizations"] == [{"to": [{"email": "a@example.com"}], "subject": "Subject"}]
+    assert requests[0]["content"] == [{"type": "text/plain", "value": "Body"}]
+
+def test_send_email_list_gives_each_recipient_a_personalization(sendgrid):
+    requests, _ = sendgrid
+    emails = ["a@example.com", "b@example.com", "c@example.com"]
+    asyncio.run(email_service.send_email(emails, "Subject", "Body"))
+
+    assert len(requests) == 1
+    assert _recipients(requests[0]) == emails
+    assert all(len(p["to"]) == 1 and p["subject"] == "Subject" for p in requests[0]["personalizations"])
+
+def test_send_email_batches_large_recipient_lists(sendgrid):
+    requests, _ = sendgrid
+    emails = [f"user{i}@example.com" for i in range(2500)]
+    asyncio.run(email_service.send_email(emails, "Subject", "Body"))
+
+    assert [len(r["personalizations"]) for r in requests] == [1000, 1000, 500]
+    assert [email for r in requests for email in _recipients(r)] == emails
+
+def test_send_email_exact_batch_size(sendgrid):
+    requests, _ = sendgrid
+    emails = [f"user{i}@example.com" for i in range(email_service._MAX_PERSONALIZATIONS)]
+    asyncio.run(email_service.send_email(iter(emails), "Subject", "Body"))
+
+    assert [len(r["personalizations"]) for r in requests] == [1000]
+
+def test_send_email_stops_at_failed_batch(sendgrid):
+    requests, responses = sendgrid
+    responses.extend([httpx.Response(202), httpx.Response(429, text="Too many requests")])
+    emails = [f"user{i}@example.com" for i in range(2500)]
+
+    with pytest.raises(Exception, match="SendGrid API error: 429 - Too many requests"):
+        asyncio.run(email_service.send_email(emails, "Subject", "Body"))
+    assert len(requests) == 2
+
+def test_send_email_requires_api_key(monkeypatch):
+    monkeypatch.setattr(email_service, "_SENDGRID_KEY", None)
+    with pytest.raises(ValueError):
+        asyncio.run(email_service.send_email("a@example.com", "Subject", "Body"))
@@ -0,0 +1,139 @@
+from datetime import datetime, timedelta
+
+import dateparser
+import pytest
+
+from app.services.whatsapp_parser import WhatsAppChatParser
+
+# A Monday, so weekday arithmetic is easy to read
+REFERENCE = datetime(2024, 3, 4, 10, 0)
+
+@pytest.fixture
+def parser():
+    return WhatsAppChatParser()
+
+def _found(parser, message):
+    return [
+        (p['task'], p['date'], p['confidence'])
+        for p in parser._find_deadline_patterns(message, message.lower(), REFERENCE)
+    ]
+
+def _deadline(title, hours, confidence=0.7):
+    return {'title': title, 'due_date': REFERENCE + timedelta(hours=hours), 'confidence': confidence}
+
+# Alternation dispatch: match.lastgroup names the alternative that matched
+
+@pytest.mark.parametrize("message, expected", [
+    # deadline alternative 2 (tN/dN groups other than the first)
+    ("Physics report deadline is friday 5pm, ok",
+     [("Physics report", REFERENCE + timedelta(days=4), 0.9)]),
+    # deadline alternative 3 ("submit ... by ...") plus the dateless event alternative
+    ("Please submit the essay by next week.",
+     [("the essay", REFERENCE + timedelta(days=7), 0.9),
+      ("Please submit the essay by", REFERENCE + timedelta(days=1), 0.7)]),
+    # event alternative 1 with a date capture
+    ("Team meeting is on thursday.",
+     [("Team", REFERENCE + timedelta(days=3), 0.7)]),
+    # event alternative 2 has no date group, so lastgroup is the task
+    ("Quiz tomorrow guys",
+     [("Quiz", REFERENCE + timedelta(days=1), 0.7)]),
+    ("History essay due on March 20, thanks",
+     [("History essay", datetime(2024, 3, 20), 0.9)]),
+])
+def test_find_deadline_patterns_matches_per_pattern_scan(parser, message, expected):
+    # Same results as scanning each pattern separately (pre-alternation output)
+    assert _found(parser, message) == expected
+
+@pytest.mark.parametrize("message, expected, dropped", [
+    ("Math homework is due tomorrow.",
+     [("Math homework", REFERENCE + timedelta(days=1), 0.9),
+      ("Math homework is due", REFERENCE + timedelta(days=1), 0.7)],
+     ("Math", REFERENCE + timedelta(days=1), 0.9)),
+    ("Chemistry lab assignment due monday",
+     [("Chemistry lab assignment", REFERENCE + timedelta(days=7), 0.9)],
+     ("Chemistry lab", REFERENCE + timedelta(days=7), 0.9)),
+])
+def test_find_deadline_patterns_one_match_per_span(parser, message, expected, dropped):
+    # Each alternation matches a span once, so a later alternative no longer
+    # adds a second, shorter task for text an earlier one already matched
+    found = _found(parser, message)
+    assert found == expected
+    assert dropped not in found
+
+# Export timestamps: strptime fast path with adaptive day order
+
+@pytest.mark.parametrize("date_str, time_str", [
+    ("12/25/23", "14:30"),
+    ("03/04/24", "09:15"),
+    ("3/4/2024", "09:15:30"),
+])
+def test_parse_timestamp_matches_dateparser(parser, date_str, time_str):
+    assert parser._parse_timestamp(date_str, time_str) == dateparser.parse(f"{date_str} {time_str}")
+
+def test_parse_timestamp_prefers_last_day_order(parser):
+    assert parser._parse_timestamp("03/04/24", "09:15") == datetime(2024, 3, 4, 9, 15)
+
+    # Only day-first parses this, so the export is taken to be day-first
+    assert parser._parse_timestamp("25/12/23", "10:00") == datetime(2023, 12, 25, 10, 0)
+    assert parser._date_orders == ['%d/%m/', '%m/%d/']
+
+    # dateparser alone would read this month-first
+    assert parser._parse_timestamp("03/04/24", "09:15") == datetime(2024, 4, 3, 9, 15)
+
+def test_parse_timestamp_falls_back_to_dateparser(parser):
+    assert parser._parse_timestamp("3/4/24", "25:00") is None
+    assert parser._date_orders == ['%m/%d/', '%d/%m/']
+
+# Title similarity
+
+def test_similar_strings_ignores_case_and_order(parser):
+    assert parser._similar_strings("Submit Lab report", "lab report submit")
+
+def test_similar_strings_uses_jaccard(parser):
+    # 7 shared words: 7/10 passed the old overlap/max(len) check, but the
+    # union has 11 words, so Jaccard similarity is below the threshold
+    assert not parser._similar_strings("a b c d e f g h i j", "a b c d e f g x")
+    assert parser._similar_strings("a b c d e f g h i j", "a b c d e f g h i x")
+
+def test_similar_strings_empty_title(parser):
+    assert not parser._similar_strings("", "lab report")
+
+# Duplicate removal over a sliding due-date window
+
+def test_remove_duplicates_keeps_higher_confidence(parser):
+    deadlines = [
+        _deadline("Lab report", 0, 0.7),
+        _deadline("lab report", 2, 0.9),
+    ]
+    assert parser._remove_duplicates(deadlines) == [deadlines[1]]
+
+def test_remove_duplicates_keeps_first_on_equal_confidence(parser):
+    deadlines = [_deadline("Lab report", 0), _deadline("Lab report", 23)]
+    assert parser._remove_duplicates(deadlines) == [deadlines[0]]
+
+def test_remove_duplicates_keeps_deadlines_a_day_apart(parser):
+    deadlines = [_deadline("Lab report", 0), _deadline("Lab report", 24), _deadline("Lab report", 48)]
+    assert parser._remove_duplicates(deadlines) == deadlines
+
+def test_remove_duplicates_matches_full_scan(parser):
+    # Unsorted input: the result holds the same deadlines the old scan of
+    # every kept deadline did, now in due-date order
+    deadlines = [
+        _deadline("Physics exam", 30, 0.7),
+        _deadline("Lab report", 5, 0.7),
+        _deadline("Math quiz", 1, 0.9),
+        _deadline("physics exam", 40, 0.9),
+        _deadline("Lab report", 0, 0.9),
+        _deadline("Math quiz", 26, 0.7),
+    ]
+    assert parser._remove_duplicates(deadlines) == [deadlines[4], deadlines[2], deadlines[5], deadlines[3]]
+
+def test_remove_duplicates_replacement_stays_in_window(parser):
+    # The higher-confidence replacement is due later, so the next deadline
+    # is compared against it rather than against the evicted original
+    deadlines = [
+        _deadline("Lab report", 0, 0.7),
+        _deadline("Lab report", 20, 0.9),
+        _deadline("Lab report", 30, 0.7),
+    ]
+    assert parser._remove_duplicates(deadlines) == [deadlines[1]]
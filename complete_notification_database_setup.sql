@@ -95,10 +95,67 @@ CREATE TRIGGER on_auth_user_created
     AFTER INSERT ON auth.users
     FOR EACH ROW EXECUTE PROCEDURE public.create_notification_settings_for_user();
 
+-- Step 9: Create sent_reminders table (one row per reminder already sent)
+CREATE TABLE IF NOT EXISTS public.sent_reminders (
+    deadline_id BIGINT NOT NULL,
+    reminder_time TEXT NOT NULL,   -- '1_hour', '1_day', ... as in notification_reminders,
+                                   -- or 'phone_upcoming' / 'phone_overdue' for SMS/WhatsApp
+    sent_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (deadline_id, reminder_time),
+    FOREIGN KEY (deadline_id) REFERENCES public.deadlines(id) ON DELETE CASCADE
+);
+
+-- Only the service role (Celery worker) writes here
+ALTER TABLE public.sent_reminders ENABLE ROW LEVEL SECURITY;
+
+-- Step 10: Create function returning every phone reminder due now
+-- (used by the send_supabase_deadline_reminders Celery task)
+DROP FUNCTION IF EXISTS public.due_reminders(INT);
+CREATE OR REPLACE FUNCTION public.due_reminders(horizon_minutes INT DEFAULT 60)
+RETURNS TABLE (
+    user_id UUID,
+    phone TEXT,
+    deadline_id BIGINT,
+    title TEXT,
+    due_date TIMESTAMPTZ,
+    portal_url TEXT,
+    priority TEXT,
+    kind TEXT
+) AS $$
+    -- Pending deadlines due within the horizon
+    SELECT u.id, u.phone::TEXT, d.id, d.title::TEXT, d.due_date, d.portal_url::TEXT, d.priority::TEXT, 'upcoming'
+    FROM public.users u
+    JOIN public.deadlines d ON d.user_id = u.id
+    WHERE u.is_active AND COALESCE(u.phone, '') <> ''
+      AND d.status = 'pending'
+      AND d.due_date BETWEEN NOW() AND NOW() + make_interval(mins => horizon_minutes)
+    UNION ALL
+    -- Overdue deadlines
+    SELECT u.id, u.phone::TEXT, d.id, d.title::TEXT, d.due_date, d.portal_url::TEXT, d.priority::TEXT, 'overdue'
+    FROM public.users u
+    JOIN public.deadlines d ON d.user_id = u.id
+    WHERE u.is_active AND COALESCE(u.phone, '') <> ''
+      AND d.status = 'overdue'
+      AND d.due_date <= NOW();
+$$ LANGUAGE sql STABLE;
+
+-- Step 11: Create indexes for the Celery reminder queries
+-- Pending/overdue deadlines due in a window, overall and per user
+-- (email reminder queries and the due_reminders join)
+CREATE INDEX IF NOT EXISTS idx_deadlines_status_due_date ON public.deadlines(status, due_date)
+    WHERE status IN ('pending', 'overdue');
+CREATE INDEX IF NOT EXISTS idx_deadlines_user_status_due_date ON public.deadlines(user_id, status, due_date);
+CREATE INDEX IF NOT EXISTS idx_notification_settings_email_enabled ON public.notification_settings(user_id)
+    WHERE email_enabled = true;
+CREATE INDEX IF NOT EXISTS idx_notification_reminders_user_email_enabled ON public.notification_reminders(user_id, reminder_time)
+    WHERE email_enabled = true;
+
 -- ===================================
 -- ✅ DATABASE SETUP COMPLETE
 -- Tables created:
 -- 1. notification_settings (stores email, phone_number, whatsapp_number)
 -- 2. notification_reminders (stores multiple reminder configurations)
--- Both tables have RLS enabled for security
+-- 3. sent_reminders (reminders already sent, to avoid duplicates)
+-- Function created: due_reminders (phone reminders due now)
+-- All tables have RLS enabled for security
 -- ===================================
\ No newline at end of file
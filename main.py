@@ -1,16 +1,27 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from app.routes import auth_router as auth_routes
 from app.routes import deadline_routes, notification_routes, whatsapp_routes, portal_routes, task_routes, notification_settings_routes
 from app.config import settings
-from app.services.notification_service import initialize_notification_service
+from app.services.notification_service import initialize_notification_service, get_notification_service
+from app.services import email_service
+from app.scrapers.utils import close_shared_connector
 import uvicorn
+import atexit
 import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging - records are handed to a background thread so
+# handler I/O never runs on the event loop
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 # Create FastAPI instance
@@ -19,7 +30,8 @@ app = FastAPI(
     description="A production-level deadline management system with portal scraping and smart notifications",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware - Production-level configuration
@@ -51,6 +63,14 @@ app.include_router(whatsapp_routes.router, tags=["whatsapp"])
 app.include_router(portal_routes.router, prefix="/api/portals", tags=["portals"])
 app.include_router(task_routes.router, prefix="/api", tags=["tasks"])
 
+@app.on_event("shutdown")
+async def close_http_clients():
+    await email_service.aclose()
+    await close_shared_connector()
+    twilio_service = get_notification_service()
+    if twilio_service is not None:
+        await twilio_service.aclose()
+
 @app.get("/")
 async def root():
     return {"message": "AI Cruel - Deadline Manager API", "version": "1.0.0"}
@@ -66,7 +86,6 @@ async def health_check():
 @app.get("/debug/config")
 async def debug_config():
     """Debug endpoint to check environment variables"""
-    import os
     return {
         "redis_url_from_settings": settings.REDIS_URL[:50] + "..." if len(settings.REDIS_URL) > 50 else settings.REDIS_URL,
         "redis_url_from_env": os.getenv("REDIS_URL", "NOT SET")[:50] + "..." if os.getenv("REDIS_URL") else "NOT SET",
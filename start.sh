@@ -9,5 +9,8 @@ celery -A app.celery_app beat --loglevel=info &
 # Start Celery Worker in background
 celery -A app.celery_app worker --loglevel=info -Q default,notifications,scraping &
 
+# Start a separate worker for the long-running reminder batches
+celery -A app.celery_app worker --loglevel=info -Q reminders -n reminders@%h --concurrency=4 --prefetch-multiplier=1 &
+
 # Start FastAPI server in foreground
 uvicorn main:app --host 0.0.0.0 --port ${PORT:-8000}
@@ -42,6 +42,19 @@ def start_processes():
         processes.append(('worker', worker_process))
         time.sleep(2)
         
+        # Start a separate worker for the long-running reminder batches
+        print("Starting Celery Reminders Worker...")
+        reminders_process = subprocess.Popen([
+            'celery', '-A', 'app.celery_app', 'worker',
+            '--loglevel=info',
+            '--pool=solo',
+            '-Q', 'reminders',
+            '-n', 'reminders@%h',
+            '--prefetch-multiplier=1'
+        ])
+        processes.append(('reminders', reminders_process))
+        time.sleep(2)
+        
         # Start Uvicorn (blocking)
         print("Starting Uvicorn...")
         port = os.getenv('PORT', '8000')